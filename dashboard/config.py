@@ -1,25 +1,39 @@
 """Dashboard configuration - paths, port, env var defaults."""
 
+import asyncio
 import os
 from pathlib import Path
+from typing import Any
 
-# Base paths
-BASE_DIR = Path(__file__).resolve().parent.parent
-DASHBOARD_DIR = Path(__file__).resolve().parent
+import yaml
+
+# Base paths (resolve symlinks once; str forms for subprocess cwd / fallbacks)
+DASHBOARD_DIR_STR = os.path.dirname(os.path.realpath(__file__))
+BASE_DIR_STR = os.path.dirname(DASHBOARD_DIR_STR)
+BASE_DIR = Path(BASE_DIR_STR)
+DASHBOARD_DIR = Path(DASHBOARD_DIR_STR)
 OUTPUTS_DIR = BASE_DIR / "outputs"
 CONFIG_FILE = BASE_DIR / "config" / "orchestra.yml"
 DB_PATH = DASHBOARD_DIR / "dashboard.db"
+OUTPUTS_DIR_STR = str(OUTPUTS_DIR)
+DB_PATH_STR = str(DB_PATH)
+# Read-only SQLite connections served alongside the single writer
+DB_READER_POOL_SIZE = int(os.getenv("DASHBOARD_DB_READERS", "4"))
+# Upper bound on git subprocesses the worktree helpers run at once
+GIT_CONCURRENCY = int(os.getenv("DASHBOARD_GIT_CONCURRENCY", str(min(8, os.cpu_count() or 4))))
 
 # Server
 HOST = os.getenv("DASHBOARD_HOST", "127.0.0.1")
 PORT = int(os.getenv("DASHBOARD_PORT", "8080"))
+WS_PING_INTERVAL = 30.0  # seconds between WebSocket PING frames
+WS_PING_TIMEOUT = 10.0   # seconds to wait for the PONG before closing
 
 # Orchestrator binary
 ORCHESTRATOR_BIN = os.getenv(
     "ORCHESTRATOR_BIN",
-    str(BASE_DIR / "target" / "release" / "agent-orchestra"),
+    os.path.join(BASE_DIR_STR, "target", "release", "agent-orchestra"),
 )
-ORCHESTRATOR_CWD = str(BASE_DIR)
+ORCHESTRATOR_CWD = BASE_DIR_STR
 
 # Cost estimation (per 1M tokens)
 COST_PER_1M_INPUT = float(os.getenv("COST_PER_1M_INPUT", "3.0"))
@@ -29,3 +43,34 @@ CHARS_PER_TOKEN = 4  # rough heuristic
 # Templates & static
 TEMPLATES_DIR = DASHBOARD_DIR / "templates"
 STATIC_DIR = DASHBOARD_DIR / "static"
+
+
+# orchestra.yml, parsed once per file version (libyaml's C loader if built in)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_orchestra_cache: tuple[tuple[int, int], Any] | None = None
+
+
+def load_orchestra_config() -> Any:
+    """Return the parsed CONFIG_FILE, re-reading it only when it changes.
+
+    The result is shared between callers — treat it as read-only.
+    Raises FileNotFoundError if the file is missing.
+    """
+    global _orchestra_cache
+    st = os.stat(CONFIG_FILE)
+    key = (st.st_mtime_ns, st.st_size)
+    if _orchestra_cache is not None and _orchestra_cache[0] == key:
+        return _orchestra_cache[1]
+    with open(CONFIG_FILE) as f:
+        cfg = yaml.load(f, Loader=_YAML_LOADER)
+    _orchestra_cache = (key, cfg)
+    return cfg
+
+
+async def load_orchestra_config_async() -> Any:
+    """load_orchestra_config() for the event loop: on a miss, read and parse in a thread."""
+    st = os.stat(CONFIG_FILE)
+    cached = _orchestra_cache
+    if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+        return cached[1]
+    return await asyncio.to_thread(load_orchestra_config)
@@ -1,34 +1,424 @@
-"""SQLite schema and CRUD operations using aiosqlite."""
+"""SQLite schema and CRUD operations.
+
+Connections are plain sqlite3 connections owned by dedicated worker threads:
+one writer thread serialises all writes, and a small pool of read-only
+connections serves SELECTs concurrently under WAL. Each helper below is a
+single hand-off to a worker thread — execute, fetch and commit all happen
+there, and only the finished result crosses back to the event loop.
+"""
 
 from __future__ import annotations
 
-import aiosqlite
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Sequence, TypeVar
 
 from . import config
 
-_db: aiosqlite.Connection | None = None
+log = logging.getLogger("dashboard.db")
+
+READER_POOL_SIZE = max(1, config.DB_READER_POOL_SIZE)
+STATEMENT_CACHE_SIZE = 256
+MAINTENANCE_INTERVAL = 900.0  # seconds between PRAGMA optimize + WAL checkpoint
+
+# TTLs (seconds) for aggregates the dashboard polls with identical arguments
+STATS_TTL = 5.0
+COST_BREAKDOWN_TTL = 15.0
+# ...and for single rows the API and callbacks look up repeatedly by key
+ROW_TTL = 5.0
+_RESULT_CACHE_MAX = 256
+
+T = TypeVar("T")
+
+_writer: sqlite3.Connection | None = None
+_writer_executor: ThreadPoolExecutor | None = None
+_readers: asyncio.Queue[sqlite3.Connection] | None = None
+_reader_conns: list[sqlite3.Connection] = []
+_reader_executor: ThreadPoolExecutor | None = None
+_open_lock = asyncio.Lock()
+_maintenance_task: asyncio.Task | None = None
+
+# UNIQUE keys the ingest paths probe for; loaded by init_db, kept current
+# by the insert helpers so existence checks never touch the database
+_known_filenames: set[str] | None = None
+_known_session_ids: set[str] | None = None
+
+# Writes deferred by an open transaction() in the current task
+_pending_writes: ContextVar[list[Callable[[sqlite3.Connection], Any]] | None] = ContextVar(
+    "_pending_writes", default=None,
+)
+
+# Connection tuning applied once per connection. WAL (persistent, switched
+# on by _connect_writer) + synchronous=NORMAL keeps commits durable across
+# app crashes without an fsync per insert.
+_PRAGMAS = """
+    PRAGMA foreign_keys=ON;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA journal_size_limit=67108864;
+    PRAGMA busy_timeout=5000;
+"""
+
+# Settings that only take effect on a brand-new database file: larger pages
+# suit the TEXT-heavy output columns, and incremental auto-vacuum lets the
+# maintenance loop hand freed pages back to the filesystem.
+_CREATE_PRAGMAS = """
+    PRAGMA page_size=8192;
+    PRAGMA auto_vacuum=INCREMENTAL;
+"""
+
+# Readers open the file read-only, so journal_mode/synchronous don't apply.
+_READER_PRAGMAS = """
+    PRAGMA query_only=ON;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+    PRAGMA busy_timeout=5000;
+"""
+
+
+def _connect(database: str, pragmas: str, **kwargs) -> sqlite3.Connection:
+    # sqlite3 keeps an LRU of prepared statements per connection; size it to
+    # hold every statement in this module so hot inserts are never re-parsed.
+    # isolation_level=None: no implicit BEGINs from the driver; _write()
+    # opens and closes every write transaction explicitly.
+    conn = sqlite3.connect(
+        database,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+        isolation_level=None,
+        **kwargs,
+    )
+    conn.executescript(pragmas)
+    return conn
+
+
+def _connect_writer(database: str) -> sqlite3.Connection:
+    conn = _connect(database, _PRAGMAS)
+    # page_size/auto_vacuum must be set before the first table (and before
+    # WAL) exists; on an existing file they would need a full VACUUM.
+    if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+        conn.executescript(_CREATE_PRAGMAS)
+    # journal_mode=WAL is stored in the file; only switch when it isn't yet
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+async def _open() -> None:
+    """Open the writer and the reader pool on first use."""
+    global _writer, _writer_executor, _readers, _reader_executor
+    async with _open_lock:
+        if _writer is not None:
+            return
+        loop = asyncio.get_running_loop()
+        writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        # The writer creates the file and switches it to WAL before any reader opens it
+        writer = await loop.run_in_executor(
+            writer_executor, _connect_writer, str(config.DB_PATH),
+        )
+        reader_executor = ThreadPoolExecutor(
+            max_workers=READER_POOL_SIZE, thread_name_prefix="db-reader",
+        )
+        pool: asyncio.Queue[sqlite3.Connection] = asyncio.Queue()
+        for _ in range(READER_POOL_SIZE):
+            conn = await loop.run_in_executor(
+                reader_executor, lambda: _connect(
+                    f"file:{config.DB_PATH}?mode=ro", _READER_PRAGMAS, uri=True,
+                ),
+            )
+            _reader_conns.append(conn)
+            pool.put_nowait(conn)
+        _writer, _writer_executor = writer, writer_executor
+        _readers, _reader_executor = pool, reader_executor
+
+
+async def _read(fn: Callable[[sqlite3.Connection], T]) -> T:
+    """Run fn(conn) on a pooled read-only connection in a reader thread."""
+    if _readers is None:
+        await _open()
+    conn = await _readers.get()
+    fut = asyncio.get_running_loop().run_in_executor(_reader_executor, fn, conn)
+    # Return the connection only once the thread is done with it, even if
+    # the awaiting task is cancelled first.
+    fut.add_done_callback(lambda _: _readers.put_nowait(conn))
+    return await asyncio.shield(fut)
+
+
+async def _on_writer(fn: Callable[[sqlite3.Connection], T]) -> T:
+    """Run fn(conn) on the writer thread as-is (autocommit, no transaction).
+
+    The single-worker executor is the write queue: jobs run one at a time in
+    submission order.
+    """
+    if _writer is None:
+        await _open()
+    return await asyncio.shield(
+        asyncio.get_running_loop().run_in_executor(_writer_executor, fn, _writer)
+    )
+
+
+async def _write(fn: Callable[[sqlite3.Connection], T]) -> T:
+    """Run fn(conn) on the writer thread inside one transaction."""
+    def run(conn: sqlite3.Connection) -> T:
+        # IMMEDIATE takes the write lock up front, so busy_timeout covers
+        # contention from other processes instead of failing mid-transaction
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        if conn.in_transaction:
+            conn.execute("COMMIT")
+        return result
+
+    return await _on_writer(run)
+
+
+# Rows come back as plain tuples and are zipped into dicts against the
+# cursor's column names, skipping the intermediate sqlite3.Row per row.
+# Callers and the JSON responses keep getting dicts.
+
+def _columns(cursor: sqlite3.Cursor) -> tuple[str, ...]:
+    return tuple(d[0] for d in cursor.description)
+
+
+async def _fetchall(sql: str, params: Sequence = ()) -> list[dict]:
+    def fetch(c: sqlite3.Connection) -> list[dict]:
+        cursor = c.execute(sql, params)
+        cols = _columns(cursor)
+        return [dict(zip(cols, row)) for row in cursor]
+    return await _read(fetch)
+
+
+async def _fetchone(sql: str, params: Sequence = ()) -> dict | None:
+    def fetch(c: sqlite3.Connection) -> dict | None:
+        cursor = c.execute(sql, params)
+        row = cursor.fetchone()
+        return dict(zip(_columns(cursor), row)) if row else None
+    return await _read(fetch)
 
 
-async def get_db() -> aiosqlite.Connection:
-    global _db
-    if _db is None:
-        _db = await aiosqlite.connect(str(config.DB_PATH))
-        _db.row_factory = aiosqlite.Row
-        await _db.execute("PRAGMA journal_mode=WAL")
-        await _db.execute("PRAGMA foreign_keys=ON")
-    return _db
+async def _fetchval(sql: str, params: Sequence = ()) -> Any:
+    def fetch(c: sqlite3.Connection) -> Any:
+        row = c.execute(sql, params).fetchone()
+        return row[0] if row else None
+    return await _read(fetch)
+
+
+async def _fetchjson(sql: str, params: Sequence = ()) -> str:
+    """Run a query whose single value is a JSON document built by SQLite."""
+    return await _fetchval(sql, params) or "[]"
+
+
+async def _execute(sql: str, params: Sequence = ()) -> None:
+    await _write_or_defer(lambda c: c.execute(sql, params))
+
+
+async def _executemany(sql: str, params: Iterable[Sequence]) -> None:
+    params = list(params)
+    await _write_or_defer(lambda c: c.executemany(sql, params))
+
+
+async def _insert(sql: str, params: Sequence) -> int | None:
+    """Run an INSERT ... RETURNING id and return the new id.
+
+    Returns None when an INSERT OR IGNORE skipped the row.
+    """
+    def run(c: sqlite3.Connection) -> int | None:
+        row = c.execute(sql, params).fetchone()
+        return row[0] if row else None
+
+    return await _write_now(run)
+
+
+async def _write_now(fn: Callable[[sqlite3.Connection], T]) -> T:
+    """Run a write whose result the caller needs immediately.
+
+    Inside transaction(), any deferred writes are flushed in the same
+    transaction ahead of it to keep statement order intact.
+    """
+    pending = _pending_writes.get()
+    batch = pending[:] if pending else []
+    if pending:
+        pending.clear()
+
+    def run(c: sqlite3.Connection) -> T:
+        for deferred in batch:
+            deferred(c)
+        return fn(c)
+
+    return await _write(run)
+
+
+async def _write_or_defer(fn: Callable[[sqlite3.Connection], Any]) -> None:
+    pending = _pending_writes.get()
+    if pending is not None:
+        pending.append(fn)
+    else:
+        await _write(fn)
+
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[None]:
+    """Group every write issued inside the block into one commit.
+
+    The usual helpers keep working unchanged: UPDATE-style writes are queued
+    and run back to back in a single writer-thread transaction on exit, and
+    an insert (which must return its id) flushes the queue together with
+    itself. Queued writes are dropped if the block raises. Reads inside the
+    block don't see the queued writes.
+    """
+    if _pending_writes.get() is not None:
+        # Nested: the outermost block commits
+        yield
+        return
+    pending: list[Callable[[sqlite3.Connection], Any]] = []
+    token = _pending_writes.set(pending)
+    try:
+        yield
+    finally:
+        _pending_writes.reset(token)
+    if pending:
+        await _write(lambda c: [fn(c) for fn in pending])
+        # Helpers invalidated when they queued; drop anything read since
+        _invalidate_cache()
+
+
+# ── Result cache ────────────────────────────────────────────────────────
+
+_result_cache: dict[str, tuple[float, Any]] = {}
+# Fetches in progress, shared by concurrent callers asking for the same key
+_inflight: dict[str, asyncio.Future] = {}
+# Bumped by every invalidation so a fetch that raced a write isn't stored
+_cache_epoch = 0
+
+
+async def _cached(key: str, ttl: float, fetch: Callable[[], Awaitable[T]]) -> T:
+    """Return a cached result younger than ttl, else run fetch() and store it.
+
+    Concurrent misses for one key share a single fetch.
+    """
+    now = time.monotonic()
+    hit = _result_cache.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    epoch = _cache_epoch
+    fut = asyncio.ensure_future(fetch())
+    _inflight[key] = fut
+    try:
+        value = await asyncio.shield(fut)
+    finally:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+    if epoch == _cache_epoch:
+        if key not in _result_cache and len(_result_cache) >= _RESULT_CACHE_MAX:
+            # FIFO eviction: dicts iterate in insertion order
+            _result_cache.pop(next(iter(_result_cache)))
+        _result_cache[key] = (now, value)
+    return value
+
+
+def _invalidate_cache() -> None:
+    global _cache_epoch
+    _cache_epoch += 1
+    _result_cache.clear()
+    _inflight.clear()
+
+
+async def _maintenance_loop() -> None:
+    """Keep planner stats fresh and the WAL file bounded on a long-lived DB."""
+    def maintain(conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA optimize")
+        # No-op unless the file was created with auto_vacuum=INCREMENTAL
+        conn.execute("PRAGMA incremental_vacuum(1000)").fetchall()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+        try:
+            await _on_writer(maintain)
+        except sqlite3.Error as e:
+            log.warning("DB maintenance failed: %s", e)
 
 
 async def close_db() -> None:
-    global _db
-    if _db is not None:
-        await _db.close()
-        _db = None
+    global _writer, _writer_executor, _readers, _reader_executor
+    global _known_filenames, _known_session_ids, _maintenance_task
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+        _maintenance_task = None
+    _invalidate_cache()
+    _known_filenames = _known_session_ids = None
+    if _writer is None:
+        return
+    loop = asyncio.get_running_loop()
+
+    def close_writer(conn: sqlite3.Connection) -> None:
+        # Let SQLite refresh planner statistics for tables that need it
+        conn.execute("PRAGMA optimize")
+        conn.close()
+
+    await loop.run_in_executor(_writer_executor, close_writer, _writer)
+    for conn in _reader_conns:
+        await loop.run_in_executor(_reader_executor, conn.close)
+    _reader_conns.clear()
+    _writer_executor.shutdown(wait=False)
+    _reader_executor.shutdown(wait=False)
+    _writer = _writer_executor = _readers = _reader_executor = None
+
+
+# Virtual generated column: computed from the TEXT timestamp on read and kept
+# as an integer in its index, so inserts stay unchanged. It is part of the
+# row (SELECT * and the JSON builders return it; app.js builds page cursors
+# from it). Unparseable timestamps map to 0 rather than NULL, which a keyset
+# comparison would never match.
+_EPOCH_EXPR = "COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), 0)"
+_EPOCH_COLUMN = f"INTEGER GENERATED ALWAYS AS ({_EPOCH_EXPR}) VIRTUAL"
 
 
 async def init_db() -> None:
-    db = await get_db()
-    await db.executescript(
+    if sqlite3.sqlite_version_info < (3, 35, 0):
+        # INSERT ... RETURNING; generated columns need 3.31
+        raise RuntimeError(
+            f"SQLite >= 3.35 required, found {sqlite3.sqlite_version}"
+        )
+    global _maintenance_task
+    # Schema setup manages its own transactions (executescript commits)
+    await _on_writer(_create_tables)
+    await _load_known_keys()
+    if _maintenance_task is None:
+        _maintenance_task = asyncio.create_task(_maintenance_loop())
+
+
+async def _load_known_keys() -> None:
+    global _known_filenames, _known_session_ids
+
+    def load(c: sqlite3.Connection) -> tuple[set[str], set[str]]:
+        return (
+            {r[0] for r in c.execute(
+                "SELECT filename FROM executions WHERE filename IS NOT NULL")},
+            {r[0] for r in c.execute("SELECT session_id FROM team_sessions")},
+        )
+
+    _known_filenames, _known_session_ids = await _read(load)
+
+
+def _create_tables(db: sqlite3.Connection) -> None:
+    db.executescript(
         """
         CREATE TABLE IF NOT EXISTS executions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -90,40 +480,89 @@ async def init_db() -> None:
             FOREIGN KEY (session_id) REFERENCES team_sessions(id) ON DELETE CASCADE
         );
 
-        CREATE INDEX IF NOT EXISTS idx_executions_timestamp ON executions(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_agent_results_execution ON agent_results(execution_id);
-        CREATE INDEX IF NOT EXISTS idx_agent_results_agent ON agent_results(agent);
-        CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_agent_results_exec_ts ON agent_results(execution_id, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_agent_results_agent_ts ON agent_results(agent, timestamp DESC);
         CREATE INDEX IF NOT EXISTS idx_team_sessions_started ON team_sessions(started_at);
         CREATE INDEX IF NOT EXISTS idx_team_tasks_session ON team_tasks(session_id);
         """
     )
-    await db.commit()
 
     # GM tables
-    await _ensure_gm_tables()
-
-    # Idempotent schema migration: add worktree columns to team_sessions
-    for col, coldef in [
-        ("repo_path", "TEXT"),
-        ("branch_name", "TEXT"),
-        ("worktree_path", "TEXT"),
+    _ensure_gm_tables(db)
+
+    # Per-agent running totals and table row counts
+    _ensure_agent_summary(db)
+    _ensure_counters(db)
+
+    # Idempotent schema migration: add worktree columns to team_sessions and
+    # integer epoch shadows of the ISO timestamps that list pages sort by
+    existing: dict[str, set[str]] = {}
+    missing: list[str] = []
+    for table in ("executions", "logs"):
+        table_sql = db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        if "timestamp_i" in table_sql and _EPOCH_EXPR not in table_sql:
+            # Older epoch column that could be NULL: drop it (and the indexes
+            # on it, re-created below) so it is re-added with the new expression
+            missing.extend(
+                f"DROP INDEX IF EXISTS {r[0]};"
+                for r in db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?"
+                    " AND sql LIKE '%timestamp_i%'", (table,)
+                )
+            )
+            missing.append(f"ALTER TABLE {table} DROP COLUMN timestamp_i;")
+            existing[table] = set()
+    for table, col, coldef in [
+        ("team_sessions", "repo_path", "TEXT"),
+        ("team_sessions", "branch_name", "TEXT"),
+        ("team_sessions", "worktree_path", "TEXT"),
+        ("executions", "timestamp_i", _EPOCH_COLUMN),
+        ("logs", "timestamp_i", _EPOCH_COLUMN),
     ]:
-        try:
-            await db.execute(f"ALTER TABLE team_sessions ADD COLUMN {col} {coldef}")
-            await db.commit()
-        except Exception:
-            pass  # Column already exists
+        if table not in existing:
+            # table_xinfo (unlike table_info) also lists generated columns
+            existing[table] = {r[1] for r in db.execute(f"PRAGMA table_xinfo({table})")}
+        if col not in existing[table]:
+            missing.append(f"ALTER TABLE {table} ADD COLUMN {col} {coldef};")
+    if missing:
+        # DDL autocommits per statement unless wrapped; apply all in one commit
+        db.executescript("BEGIN;\n" + "\n".join(missing) + "\nCOMMIT;")
+    db.executescript(
+        """
+        DROP INDEX IF EXISTS idx_executions_timestamp;
+        DROP INDEX IF EXISTS idx_logs_timestamp;
+        DROP INDEX IF EXISTS idx_agent_results_execution;
+        DROP INDEX IF EXISTS idx_agent_results_agent;
+        CREATE INDEX IF NOT EXISTS idx_executions_timestamp_i ON executions(timestamp_i);
+        CREATE INDEX IF NOT EXISTS idx_logs_timestamp_i ON logs(timestamp_i);
+        CREATE INDEX IF NOT EXISTS idx_logs_level_timestamp_i ON logs(level, timestamp_i);
+        """
+    )
+
+    # Seed planner statistics once; PRAGMA optimize on close keeps them fresh
+    if db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone() is None:
+        db.execute("ANALYZE")
 
 
 # ── Execution CRUD ──────────────────────────────────────────────────────
 
 async def execution_exists(filename: str) -> bool:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT 1 FROM executions WHERE filename = ?", (filename,)
-    )
-    return await cursor.fetchone() is not None
+    if _known_filenames is not None:
+        return filename in _known_filenames
+    return await _fetchval(
+        "SELECT 1 FROM executions WHERE filename = ?", (filename,),
+    ) is not None
+
+
+_EXECUTION_INSERT = """INTO executions
+           (timestamp, mode, global_client_mode, filename,
+            agent_count, success_count, fail_count, estimated_cost)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           RETURNING id"""
 
 
 async def insert_execution(
@@ -136,17 +575,40 @@ async def insert_execution(
     fail_count: int,
     estimated_cost: float,
 ) -> int:
-    db = await get_db()
-    cursor = await db.execute(
-        """INSERT INTO executions
-           (timestamp, mode, global_client_mode, filename,
-            agent_count, success_count, fail_count, estimated_cost)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+    row_id = await _insert(
+        "INSERT " + _EXECUTION_INSERT,
         (timestamp, mode, global_client_mode, filename,
          agent_count, success_count, fail_count, estimated_cost),
     )
-    await db.commit()
-    return cursor.lastrowid
+    _execution_inserted(filename)
+    return row_id
+
+
+async def insert_execution_if_absent(
+    timestamp: str,
+    mode: str,
+    global_client_mode: str | None,
+    filename: str | None,
+    agent_count: int,
+    success_count: int,
+    fail_count: int,
+    estimated_cost: float,
+) -> int | None:
+    """Insert unless `filename` is already recorded. Returns the new id or None."""
+    row_id = await _insert(
+        "INSERT OR IGNORE " + _EXECUTION_INSERT,
+        (timestamp, mode, global_client_mode, filename,
+         agent_count, success_count, fail_count, estimated_cost),
+    )
+    if row_id is not None:
+        _execution_inserted(filename)
+    return row_id
+
+
+def _execution_inserted(filename: str | None) -> None:
+    if filename is not None and _known_filenames is not None:
+        _known_filenames.add(filename)
+    _invalidate_cache()
 
 
 async def insert_agent_result(
@@ -159,169 +621,418 @@ async def insert_agent_result(
     timestamp: str | None,
     estimated_cost: float,
 ) -> int:
-    db = await get_db()
-    cursor = await db.execute(
+    row_id = await _insert(
         """INSERT INTO agent_results
            (execution_id, agent, status, output, error,
             client_mode, timestamp, estimated_cost)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           RETURNING id""",
         (execution_id, agent, status, output, error,
          client_mode, timestamp, estimated_cost),
     )
-    await db.commit()
-    return cursor.lastrowid
+    _invalidate_cache()
+    return row_id
+
+
+async def insert_agent_results_many(
+    execution_id: int,
+    rows: Iterable[tuple],
+) -> None:
+    """Insert many agent results in one transaction.
+
+    Each row is (agent, status, output, error, client_mode, timestamp, estimated_cost).
+    """
+    params = [(execution_id, *r) for r in rows]
+    if not params:
+        return
+    await _executemany(_AGENT_RESULTS_INSERT, params)
+    _invalidate_cache()
+
+
+_AGENT_RESULTS_INSERT = """INSERT INTO agent_results
+           (execution_id, agent, status, output, error,
+            client_mode, timestamp, estimated_cost)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+async def insert_execution_with_results(
+    timestamp: str,
+    mode: str,
+    global_client_mode: str | None,
+    filename: str | None,
+    agent_count: int,
+    success_count: int,
+    fail_count: int,
+    estimated_cost: float,
+    results: Iterable[tuple],
+) -> int | None:
+    """insert_execution_if_absent() plus its agent results, in one commit.
+
+    `results` rows are as for insert_agent_results_many(). Returns the new
+    execution id, or None (and inserts nothing) if `filename` is known.
+    """
+    execution = (timestamp, mode, global_client_mode, filename,
+                 agent_count, success_count, fail_count, estimated_cost)
+    rows = list(results)
+    row_id = await _write_now(lambda c: _insert_execution_row(c, execution, rows))
+    if row_id is not None:
+        _execution_inserted(filename)
+    return row_id
+
+
+async def insert_executions_with_results_many(
+    executions: Iterable[tuple[tuple, Iterable[tuple]]],
+) -> list[int | None]:
+    """insert_execution_with_results() for many executions, in one commit.
+
+    Each item is (execution, results): `execution` holds insert_execution()'s
+    arguments in order, `results` its agent result rows. Returns the new ids
+    in input order, None where the filename was already known.
+    """
+    items = [(tuple(e), list(r)) for e, r in executions]
+    if not items:
+        return []
+    ids = await _write_now(lambda c: [_insert_execution_row(c, e, r) for e, r in items])
+    for (execution, _), row_id in zip(items, ids):
+        if row_id is not None:
+            _execution_inserted(execution[3])
+    return ids
+
+
+def _insert_execution_row(
+    c: sqlite3.Connection, execution: Sequence, results: list[tuple],
+) -> int | None:
+    row = c.execute("INSERT OR IGNORE " + _EXECUTION_INSERT, execution).fetchone()
+    if row is None:
+        return None
+    c.executemany(_AGENT_RESULTS_INSERT, [(row[0], *r) for r in results])
+    return row[0]
 
 
-async def get_executions(limit: int = 50, offset: int = 0) -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
-        """SELECT * FROM executions ORDER BY timestamp DESC LIMIT ? OFFSET ?""",
-        (limit, offset),
+# (sort key, id) of the last row on the previous page
+Cursor = tuple[Any, int]
+
+
+def _page(
+    select: str,
+    sort_key: str,
+    limit: int,
+    offset: int,
+    before: Cursor | None,
+    filters: Sequence[tuple[str, Any]] = (),
+) -> tuple[str, tuple]:
+    """Build a newest-first page query over (sort_key, id).
+
+    With `before`, the page starts right after that row using a keyset
+    condition the (sort_key) index can seek to, so deep pages cost the same
+    as the first one; `offset` is then ignored.
+    """
+    where = [clause for clause, _ in filters]
+    params: list[Any] = [value for _, value in filters]
+    if before is not None:
+        where.append(f"({sort_key}, id) < (?, ?)")
+        params.extend(before)
+        offset = 0
+    sql = select
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {sort_key} DESC, id DESC LIMIT ? OFFSET ?"
+    return sql, (*params, limit, offset)
+
+
+async def get_executions(
+    limit: int = 50, offset: int = 0, before: Cursor | None = None,
+) -> list[dict]:
+    return await _fetchall(
+        *_page("SELECT * FROM executions", "timestamp_i", limit, offset, before)
     )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
+
+
+_EXECUTION_OBJECT = """json_object(
+               'id', id, 'timestamp', timestamp, 'mode', mode,
+               'global_client_mode', global_client_mode, 'filename', filename,
+               'agent_count', agent_count, 'success_count', success_count,
+               'fail_count', fail_count, 'estimated_cost', estimated_cost,
+               'timestamp_i', timestamp_i"""
+
+_EXECUTIONS_JSON = f"SELECT json_group_array({_EXECUTION_OBJECT})) FROM ({{}})"
+
+# One execution with its agent results nested under "results", encoded in
+# a single statement instead of a dict per result row
+_EXECUTION_DETAIL_JSON = f"""SELECT {_EXECUTION_OBJECT},
+               'results', (
+                   SELECT json_group_array(json_object(
+                       'id', id, 'execution_id', execution_id, 'agent', agent,
+                       'status', status, 'output', output, 'error', error,
+                       'client_mode', client_mode, 'timestamp', timestamp,
+                       'estimated_cost', estimated_cost))
+                   FROM (SELECT * FROM agent_results
+                         WHERE execution_id = executions.id ORDER BY timestamp)
+               ))
+           FROM executions WHERE id = ?"""
+
+
+async def get_executions_json(
+    limit: int = 50, offset: int = 0, before: Cursor | None = None,
+) -> str:
+    """get_executions() as a ready-to-send JSON array, encoded by SQLite."""
+    sql, params = _page("SELECT * FROM executions", "timestamp_i", limit, offset, before)
+    return await _fetchjson(_EXECUTIONS_JSON.format(sql), params)
 
 
 async def get_execution(execution_id: int) -> dict | None:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM executions WHERE id = ?", (execution_id,)
+    """Fetch one execution (cached briefly; treat the dict as read-only)."""
+    return await _cached(
+        f"execution:{execution_id}", ROW_TTL,
+        lambda: _fetchone("SELECT * FROM executions WHERE id = ?", (execution_id,)),
     )
-    row = await cursor.fetchone()
-    return dict(row) if row else None
+
+
+async def get_execution_detail_json(execution_id: int) -> str | None:
+    """get_execution() plus its agent results as one JSON object; None if absent."""
+    return await _fetchval(_EXECUTION_DETAIL_JSON, (execution_id,))
 
 
 async def get_agent_results(execution_id: int) -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
+    return await _fetchall(
         "SELECT * FROM agent_results WHERE execution_id = ? ORDER BY timestamp",
         (execution_id,),
     )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
 
 
 async def get_execution_count() -> int:
-    db = await get_db()
-    cursor = await db.execute("SELECT COUNT(*) FROM executions")
-    row = await cursor.fetchone()
-    return row[0]
+    return await _get_counter("executions")
 
 
 # ── Stats ───────────────────────────────────────────────────────────────
 
 async def get_stats() -> dict:
-    db = await get_db()
-
-    cursor = await db.execute("SELECT COUNT(*) FROM executions")
-    total_exec = (await cursor.fetchone())[0]
-
-    cursor = await db.execute("SELECT COUNT(*) FROM agent_results")
-    total_agents = (await cursor.fetchone())[0]
-
-    cursor = await db.execute(
-        "SELECT COUNT(*) FROM agent_results WHERE status = 'success'"
+    return await _cached("stats", STATS_TTL, _query_stats)
+
+
+async def _query_stats() -> dict:
+    row = await _fetchone(
+        """WITH e AS (
+             SELECT COUNT(*) AS n, SUM(estimated_cost) AS cost FROM executions
+           ), a AS (
+             -- running per-agent totals; avoids scanning agent_results
+             SELECT COALESCE(SUM(total_runs), 0) AS n, SUM(successes) AS ok
+             FROM agent_summary
+           )
+           SELECT e.n AS total_exec, a.n AS total_agents,
+             COALESCE(a.ok, 0) AS total_success, ROUND(e.cost, 6) AS total_cost,
+             (SELECT timestamp FROM executions ORDER BY timestamp_i DESC LIMIT 1) AS last_exec
+           FROM e, a"""
     )
-    total_success = (await cursor.fetchone())[0]
+    total_agents = row["total_agents"]
+    total_cost = row["total_cost"] or 0.0
 
-    cursor = await db.execute("SELECT SUM(estimated_cost) FROM executions")
-    row = await cursor.fetchone()
-    total_cost = row[0] or 0.0
-
-    cursor = await db.execute(
-        "SELECT timestamp FROM executions ORDER BY timestamp DESC LIMIT 1"
-    )
-    row = await cursor.fetchone()
-    last_exec = row[0] if row else None
-
-    success_rate = (total_success / total_agents * 100) if total_agents > 0 else 0.0
+    success_rate = (row["total_success"] / total_agents * 100) if total_agents > 0 else 0.0
 
     return {
-        "total_executions": total_exec,
+        "total_executions": row["total_exec"],
         "total_agents_run": total_agents,
         "success_rate": round(success_rate, 1),
-        "total_cost": round(total_cost, 6),
-        "last_execution": last_exec,
+        "total_cost": total_cost,
+        "last_execution": row["last_exec"],
     }
 
 
-async def get_agent_summaries() -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
-        """SELECT
-             agent,
-             COUNT(*) as total_runs,
-             SUM(CASE WHEN status='success' THEN 1 ELSE 0 END) as successes,
-             SUM(CASE WHEN status='failed' THEN 1 ELSE 0 END) as failures,
-             MAX(timestamp) as last_run
-           FROM agent_results
-           GROUP BY agent
-           ORDER BY agent"""
-    )
-    rows = await cursor.fetchall()
-    results = []
-    for r in rows:
-        d = dict(r)
-        # get last status
-        cursor2 = await db.execute(
-            """SELECT status FROM agent_results
-               WHERE agent = ? ORDER BY timestamp DESC LIMIT 1""",
-            (d["agent"],),
+_AGENT_SUMMARY_TABLE = """
+CREATE TABLE IF NOT EXISTS agent_summary (
+    agent TEXT PRIMARY KEY,
+    total_runs INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    last_run TEXT,
+    last_status TEXT,
+    sum_output_len INTEGER NOT NULL,
+    total_cost REAL NOT NULL DEFAULT 0.0
+);
+"""
+
+_AGENT_SUMMARY_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_agent_results_summary
+AFTER INSERT ON agent_results
+BEGIN
+    INSERT INTO agent_summary
+        (agent, total_runs, successes, failures, last_run, last_status,
+         sum_output_len, total_cost)
+    VALUES
+        (NEW.agent, 1, NEW.status = 'success', NEW.status = 'failed',
+         NEW.timestamp, NEW.status, LENGTH(COALESCE(NEW.output, '')),
+         COALESCE(NEW.estimated_cost, 0.0))
+    ON CONFLICT(agent) DO UPDATE SET
+        total_runs = total_runs + 1,
+        successes = successes + (NEW.status = 'success'),
+        failures = failures + (NEW.status = 'failed'),
+        last_status = CASE WHEN last_run IS NULL OR NEW.timestamp >= last_run
+                           THEN NEW.status ELSE last_status END,
+        last_run = CASE WHEN last_run IS NULL OR NEW.timestamp > last_run
+                        THEN NEW.timestamp ELSE last_run END,
+        sum_output_len = sum_output_len + LENGTH(COALESCE(NEW.output, '')),
+        total_cost = total_cost + COALESCE(NEW.estimated_cost, 0.0);
+END;
+"""
+
+# Backfill from existing history, once, when the table is first created
+_AGENT_SUMMARY_BACKFILL = """
+INSERT INTO agent_summary
+SELECT
+  agent,
+  COUNT(*),
+  SUM(status = 'success'),
+  SUM(status = 'failed'),
+  MAX(timestamp),
+  (SELECT a2.status FROM agent_results a2
+   WHERE a2.agent = a1.agent
+   ORDER BY a2.timestamp DESC LIMIT 1),
+  SUM(LENGTH(COALESCE(output, ''))),
+  COALESCE(SUM(estimated_cost), 0.0)
+FROM agent_results a1
+GROUP BY agent;
+"""
+
+
+def _ensure_agent_summary(db: sqlite3.Connection) -> None:
+    """Create the trigger-maintained agent_summary table (idempotent).
+
+    agent_results is append-only, so per-agent totals are kept up to date on
+    insert instead of re-aggregated over the whole table on every read.
+    """
+    if db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'agent_summary'"
+    ).fetchone() is None:
+        # Table, trigger and backfill commit together: an interrupted first
+        # start leaves no table behind, so the next one backfills again
+        db.executescript(
+            "BEGIN;\n" + _AGENT_SUMMARY_TABLE + _AGENT_SUMMARY_TRIGGER
+            + _AGENT_SUMMARY_BACKFILL + "COMMIT;"
         )
-        last = await cursor2.fetchone()
-        d["last_status"] = last["status"] if last else None
-        # avg output length
-        cursor3 = await db.execute(
-            """SELECT AVG(LENGTH(COALESCE(output, ''))) as avg_len
-               FROM agent_results WHERE agent = ?""",
-            (d["agent"],),
+        return
+
+    if "total_cost" not in {r[1] for r in db.execute("PRAGMA table_xinfo(agent_summary)")}:
+        # Summary predates per-agent cost: add it and re-create the trigger
+        db.executescript(
+            """
+            BEGIN;
+            ALTER TABLE agent_summary ADD COLUMN total_cost REAL NOT NULL DEFAULT 0.0;
+            UPDATE agent_summary SET total_cost = (
+                SELECT COALESCE(SUM(estimated_cost), 0.0) FROM agent_results
+                WHERE agent_results.agent = agent_summary.agent
+            );
+            DROP TRIGGER IF EXISTS trg_agent_results_summary;
+            """
+            + _AGENT_SUMMARY_TRIGGER + "COMMIT;"
         )
-        avg_row = await cursor3.fetchone()
-        d["avg_output_len"] = round(avg_row["avg_len"] or 0, 0)
-        results.append(d)
-    return results
+    else:
+        db.executescript(_AGENT_SUMMARY_TRIGGER)
 
 
-async def get_cost_breakdown() -> dict:
-    db = await get_db()
+# Tables whose row count the list pages show; kept in `counters` by triggers
+_COUNTED_TABLES = ("executions", "team_sessions", "gm_projects")
 
-    cursor = await db.execute("SELECT SUM(estimated_cost) FROM executions")
-    total = (await cursor.fetchone())[0] or 0.0
 
-    cursor = await db.execute(
-        """SELECT mode, SUM(estimated_cost) as cost
-           FROM executions GROUP BY mode"""
+def _ensure_counters(db: sqlite3.Connection) -> None:
+    """Create the trigger-maintained row counters (idempotent)."""
+    db.execute(
+        """CREATE TABLE IF NOT EXISTS counters (
+               name TEXT PRIMARY KEY,
+               value INTEGER NOT NULL DEFAULT 0
+           )"""
     )
-    by_mode = {r["mode"]: round(r["cost"] or 0, 6) for r in await cursor.fetchall()}
+    for table in _COUNTED_TABLES:
+        db.executescript(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_ins
+            AFTER INSERT ON {table}
+            BEGIN
+                UPDATE counters SET value = value + 1 WHERE name = '{table}';
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_del
+            AFTER DELETE ON {table}
+            BEGIN
+                UPDATE counters SET value = value - 1 WHERE name = '{table}';
+            END;
+            """
+        )
+        # Seed from the table itself the first time the counter is created
+        db.execute(
+            f"INSERT OR IGNORE INTO counters (name, value) "
+            f"SELECT '{table}', COUNT(*) FROM {table}"
+        )
+
+
+async def _get_counter(name: str) -> int:
+    return await _fetchval("SELECT value FROM counters WHERE name = ?", (name,)) or 0
 
-    cursor = await db.execute(
-        """SELECT agent, SUM(estimated_cost) as cost
-           FROM agent_results GROUP BY agent"""
+
+async def get_agent_summaries() -> list[dict]:
+    return await _fetchall(
+        """SELECT
+             agent, total_runs, successes, failures, last_run, last_status,
+             ROUND(CAST(sum_output_len AS REAL) / total_runs, 0) as avg_output_len
+           FROM agent_summary
+           ORDER BY agent""",
     )
-    by_agent = {r["agent"]: round(r["cost"] or 0, 6) for r in await cursor.fetchall()}
 
-    cursor = await db.execute(
-        """SELECT DATE(timestamp) as day, SUM(estimated_cost) as cost
-           FROM executions GROUP BY DATE(timestamp) ORDER BY day"""
+
+async def get_cost_breakdown() -> dict:
+    return await _cached("cost_breakdown", COST_BREAKDOWN_TTL, _query_cost_breakdown)
+
+
+async def _query_cost_breakdown() -> dict:
+    # One statement for all four breakdowns, tagged by kind; per-agent cost
+    # comes from agent_summary so agent_results (and its output text) is
+    # never scanned
+    rows = await _fetchall(
+        """SELECT 'total' AS kind, NULL AS key, ROUND(SUM(estimated_cost), 6) AS cost
+           FROM executions
+           UNION ALL
+           SELECT 'mode', mode, ROUND(SUM(estimated_cost), 6)
+           FROM executions GROUP BY mode
+           UNION ALL
+           SELECT 'agent', agent, ROUND(total_cost, 6)
+           FROM agent_summary
+           UNION ALL
+           SELECT 'date', DATE(NULLIF(timestamp_i, 0), 'unixepoch'), ROUND(SUM(estimated_cost), 6)
+           FROM executions GROUP BY 2
+           ORDER BY kind, key"""
     )
-    by_date = {r["day"]: round(r["cost"] or 0, 6) for r in await cursor.fetchall()}
+
+    total = 0.0
+    by_kind: dict[str, dict] = {"mode": {}, "agent": {}, "date": {}}
+    for r in rows:
+        kind, key, cost = r["kind"], r["key"], r["cost"]
+        if kind == "total":
+            total = cost or 0.0
+        else:
+            by_kind[kind][key] = cost or 0.0
 
     return {
-        "total_cost": round(total, 6),
-        "by_mode": by_mode,
-        "by_agent": by_agent,
-        "by_date": by_date,
+        "total_cost": total,
+        "by_mode": by_kind["mode"],
+        "by_agent": by_kind["agent"],
+        "by_date": by_kind["date"],
     }
 
 
 # ── Team Sessions ──────────────────────────────────────────────────────
 
 async def team_session_exists(session_id: str) -> bool:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT 1 FROM team_sessions WHERE session_id = ?", (session_id,)
-    )
-    return await cursor.fetchone() is not None
+    if _known_session_ids is not None:
+        return session_id in _known_session_ids
+    return await _fetchval(
+        "SELECT 1 FROM team_sessions WHERE session_id = ?", (session_id,),
+    ) is not None
+
+
+_TEAM_SESSION_INSERT = """INTO team_sessions
+           (session_id, team_name, task_description, status, started_at,
+            completed_at, filename, teammate_count, success_count, fail_count)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+           RETURNING id"""
 
 
 async def insert_team_session(
@@ -336,17 +1047,42 @@ async def insert_team_session(
     success_count: int,
     fail_count: int,
 ) -> int:
-    db = await get_db()
-    cursor = await db.execute(
-        """INSERT INTO team_sessions
-           (session_id, team_name, task_description, status, started_at,
-            completed_at, filename, teammate_count, success_count, fail_count)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+    row_id = await _insert(
+        "INSERT " + _TEAM_SESSION_INSERT,
+        (session_id, team_name, task_description, status, started_at,
+         completed_at, filename, teammate_count, success_count, fail_count),
+    )
+    _team_session_inserted(session_id)
+    return row_id
+
+
+async def insert_team_session_if_absent(
+    session_id: str,
+    team_name: str,
+    task_description: str | None,
+    status: str,
+    started_at: str,
+    completed_at: str | None,
+    filename: str | None,
+    teammate_count: int,
+    success_count: int,
+    fail_count: int,
+) -> int | None:
+    """Insert unless `session_id` is already recorded. Returns the new id or None."""
+    row_id = await _insert(
+        "INSERT OR IGNORE " + _TEAM_SESSION_INSERT,
         (session_id, team_name, task_description, status, started_at,
          completed_at, filename, teammate_count, success_count, fail_count),
     )
-    await db.commit()
-    return cursor.lastrowid
+    if row_id is not None:
+        _team_session_inserted(session_id)
+    return row_id
+
+
+def _team_session_inserted(session_id: str) -> None:
+    if _known_session_ids is not None:
+        _known_session_ids.add(session_id)
+    _invalidate_cache()
 
 
 async def insert_team_task(
@@ -359,60 +1095,129 @@ async def insert_team_task(
     started_at: str | None,
     completed_at: str | None,
 ) -> int:
-    db = await get_db()
-    cursor = await db.execute(
+    return await _insert(
         """INSERT INTO team_tasks
            (session_id, teammate, role, status, output, error, started_at, completed_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           RETURNING id""",
         (session_id, teammate, role, status, output, error, started_at, completed_at),
     )
-    await db.commit()
-    return cursor.lastrowid
 
 
-async def get_team_sessions(limit: int = 50, offset: int = 0) -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM team_sessions ORDER BY started_at DESC LIMIT ? OFFSET ?",
-        (limit, offset),
+async def insert_team_tasks_many(session_id: int, rows: Iterable[tuple]) -> None:
+    """Insert many team tasks in one transaction.
+
+    Each row is (teammate, role, status, output, error, started_at, completed_at).
+    """
+    params = [(session_id, *r) for r in rows]
+    if not params:
+        return
+    await _executemany(_TEAM_TASKS_INSERT, params)
+
+
+_TEAM_TASKS_INSERT = """INSERT INTO team_tasks
+           (session_id, teammate, role, status, output, error, started_at, completed_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+async def insert_team_session_with_tasks(
+    session_id: str,
+    team_name: str,
+    task_description: str | None,
+    status: str,
+    started_at: str,
+    completed_at: str | None,
+    filename: str | None,
+    teammate_count: int,
+    success_count: int,
+    fail_count: int,
+    tasks: Iterable[tuple],
+) -> int | None:
+    """insert_team_session_if_absent() plus its tasks, in one commit.
+
+    `tasks` rows are as for insert_team_tasks_many(). Returns the new
+    session db id, or None (and inserts nothing) if `session_id` is known.
+    """
+    session = (session_id, team_name, task_description, status, started_at,
+               completed_at, filename, teammate_count, success_count, fail_count)
+    rows = list(tasks)
+    db_id = await _write_now(lambda c: _insert_team_session_row(c, session, rows))
+    if db_id is not None:
+        _team_session_inserted(session_id)
+    return db_id
+
+
+async def insert_team_sessions_with_tasks_many(
+    sessions: Iterable[tuple[tuple, Iterable[tuple]]],
+) -> list[int | None]:
+    """insert_team_session_with_tasks() for many sessions, in one commit.
+
+    Each item is (session, tasks): `session` holds insert_team_session()'s
+    arguments in order, `tasks` its task rows. Returns the new db ids in
+    input order, None where the session_id was already known.
+    """
+    items = [(tuple(s), list(t)) for s, t in sessions]
+    if not items:
+        return []
+    ids = await _write_now(lambda c: [_insert_team_session_row(c, s, t) for s, t in items])
+    for (session, _), db_id in zip(items, ids):
+        if db_id is not None:
+            _team_session_inserted(session[0])
+    return ids
+
+
+def _insert_team_session_row(
+    c: sqlite3.Connection, session: Sequence, tasks: list[tuple],
+) -> int | None:
+    row = c.execute("INSERT OR IGNORE " + _TEAM_SESSION_INSERT, session).fetchone()
+    if row is None:
+        return None
+    c.executemany(_TEAM_TASKS_INSERT, [(row[0], *r) for r in tasks])
+    return row[0]
+
+
+async def get_team_sessions(
+    limit: int = 50, offset: int = 0, before: Cursor | None = None,
+) -> list[dict]:
+    return await _fetchall(
+        *_page("SELECT * FROM team_sessions", "started_at", limit, offset, before)
     )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
 
 
 async def get_team_session(session_id: int) -> dict | None:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM team_sessions WHERE id = ?", (session_id,)
+    return await _fetchone(
+        "SELECT * FROM team_sessions WHERE id = ?", (session_id,),
     )
-    row = await cursor.fetchone()
-    return dict(row) if row else None
 
 
 async def get_team_tasks(session_id: int) -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
+    return await _fetchall(
         "SELECT * FROM team_tasks WHERE session_id = ? ORDER BY id",
         (session_id,),
     )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
 
 
 async def get_team_session_count() -> int:
-    db = await get_db()
-    cursor = await db.execute("SELECT COUNT(*) FROM team_sessions")
-    row = await cursor.fetchone()
-    return row[0]
+    return await _get_counter("team_sessions")
 
 
 async def get_team_session_by_session_id(session_id: str) -> dict | None:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM team_sessions WHERE session_id = ?", (session_id,)
+    """Fetch one session by session_id (cached briefly; treat the dict as read-only)."""
+    return await _cached(
+        f"team_session:{session_id}", ROW_TTL,
+        lambda: _fetchone("SELECT * FROM team_sessions WHERE session_id = ?", (session_id,)),
+    )
+
+
+async def get_team_sessions_by_ids(session_ids: Iterable[str]) -> list[dict]:
+    """Fetch several sessions by session_id in one query."""
+    ids = list(session_ids)
+    if not ids:
+        return []
+    placeholders = ", ".join("?" * len(ids))
+    return await _fetchall(
+        f"SELECT * FROM team_sessions WHERE session_id IN ({placeholders})", ids,
     )
-    row = await cursor.fetchone()
-    return dict(row) if row else None
 
 
 async def update_team_session_worktree(
@@ -421,14 +1226,13 @@ async def update_team_session_worktree(
     branch_name: str,
     worktree_path: str,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await _execute(
         """UPDATE team_sessions
            SET repo_path = ?, branch_name = ?, worktree_path = ?
            WHERE session_id = ?""",
         (repo_path, branch_name, worktree_path, session_id),
     )
-    await db.commit()
+    _invalidate_cache()
 
 
 async def update_team_session_status(
@@ -436,63 +1240,84 @@ async def update_team_session_status(
     status: str,
     completed_at: str | None = None,
 ) -> None:
-    db = await get_db()
-    if completed_at:
-        await db.execute(
-            "UPDATE team_sessions SET status = ?, completed_at = ? WHERE session_id = ?",
-            (status, completed_at, session_id),
-        )
-    else:
-        await db.execute(
-            "UPDATE team_sessions SET status = ? WHERE session_id = ?",
-            (status, session_id),
-        )
-    await db.commit()
+    # A missing completed_at keeps the stored one
+    await _execute(
+        "UPDATE team_sessions SET status = ?, completed_at = COALESCE(?, completed_at) "
+        "WHERE session_id = ?",
+        (status, completed_at or None, session_id),
+    )
+    _invalidate_cache()
 
 
 async def update_team_session_filename(session_id: str, filename: str) -> None:
-    db = await get_db()
-    await db.execute(
+    await _execute(
         "UPDATE team_sessions SET filename = ? WHERE session_id = ?",
         (filename, session_id),
     )
-    await db.commit()
+    _invalidate_cache()
 
 
 # ── Logs ────────────────────────────────────────────────────────────────
 
 async def insert_log(timestamp: str, level: str, message: str, source: str | None = None) -> int:
-    db = await get_db()
-    cursor = await db.execute(
-        "INSERT INTO logs (timestamp, level, message, source) VALUES (?, ?, ?, ?)",
+    return await _insert(
+        "INSERT INTO logs (timestamp, level, message, source) VALUES (?, ?, ?, ?) RETURNING id",
         (timestamp, level, message, source),
     )
-    await db.commit()
-    return cursor.lastrowid
 
 
-async def get_logs(limit: int = 100, offset: int = 0, level: str | None = None) -> list[dict]:
-    db = await get_db()
-    if level:
-        cursor = await db.execute(
-            "SELECT * FROM logs WHERE level = ? ORDER BY timestamp DESC LIMIT ? OFFSET ?",
-            (level, limit, offset),
-        )
-    else:
-        cursor = await db.execute(
-            "SELECT * FROM logs ORDER BY timestamp DESC LIMIT ? OFFSET ?",
-            (limit, offset),
-        )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
+async def insert_logs_many(rows: Iterable[tuple]) -> None:
+    """Insert many log lines in one transaction.
+
+    Each row is (timestamp, level, message, source).
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    await _executemany(
+        "INSERT INTO logs (timestamp, level, message, source) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _logs_page(
+    limit: int, offset: int, level: str | None, before: Cursor | None,
+) -> tuple[str, tuple]:
+    filters = [("level = ?", level)] if level else []
+    return _page("SELECT * FROM logs", "timestamp_i", limit, offset, before, filters)
+
+
+async def get_logs(
+    limit: int = 100,
+    offset: int = 0,
+    level: str | None = None,
+    before: Cursor | None = None,
+) -> list[dict]:
+    return await _fetchall(*_logs_page(limit, offset, level, before))
+
+
+_LOGS_JSON = """SELECT json_group_array(json_object(
+               'id', id, 'timestamp', timestamp, 'level', level,
+               'message', message, 'source', source, 'timestamp_i', timestamp_i))
+           FROM ({})"""
+
+
+async def get_logs_json(
+    limit: int = 100,
+    offset: int = 0,
+    level: str | None = None,
+    before: Cursor | None = None,
+) -> str:
+    """get_logs() as a ready-to-send JSON array, encoded by SQLite."""
+    sql, params = _logs_page(limit, offset, level, before)
+    return await _fetchjson(_LOGS_JSON.format(sql), params)
 
 
 # ── GM Projects ────────────────────────────────────────────────────────
 
-async def _ensure_gm_tables() -> None:
+def _ensure_gm_tables(db: sqlite3.Connection) -> None:
     """Create GM tables if they don't exist (idempotent)."""
-    db = await get_db()
-    await db.executescript(
+    db.executescript(
         """
         CREATE TABLE IF NOT EXISTS gm_projects (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -544,12 +1369,23 @@ async def _ensure_gm_tables() -> None:
         );
 
         CREATE INDEX IF NOT EXISTS idx_gm_projects_phase ON gm_projects(phase);
+        CREATE INDEX IF NOT EXISTS idx_gm_projects_started ON gm_projects(started_at);
         CREATE INDEX IF NOT EXISTS idx_gm_agent_sessions_project ON gm_agent_sessions(project_id);
-        CREATE INDEX IF NOT EXISTS idx_gm_decisions_project ON gm_decisions(project_id);
-        CREATE INDEX IF NOT EXISTS idx_gm_decisions_status ON gm_decisions(status);
+        DROP INDEX IF EXISTS idx_gm_decisions_project;
+        CREATE INDEX IF NOT EXISTS idx_gm_decisions_project_created
+            ON gm_decisions(project_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_gm_decisions_project_status_created
+            ON gm_decisions(project_id, status, created_at);
+        DROP INDEX IF EXISTS idx_gm_decisions_status;
         """
     )
-    await db.commit()
+
+
+_GM_PROJECT_INSERT = """INTO gm_projects
+           (project_id, project_name, repo_path, build_command, test_command,
+            agent_count, started_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           RETURNING id"""
 
 
 async def insert_gm_project(
@@ -561,17 +1397,33 @@ async def insert_gm_project(
     agent_count: int,
     started_at: str,
 ) -> int:
-    db = await get_db()
-    cursor = await db.execute(
-        """INSERT INTO gm_projects
-           (project_id, project_name, repo_path, build_command, test_command,
-            agent_count, started_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+    row_id = await _insert(
+        "INSERT " + _GM_PROJECT_INSERT,
         (project_id, project_name, repo_path, build_command, test_command,
          agent_count, started_at),
     )
-    await db.commit()
-    return cursor.lastrowid
+    _invalidate_cache()
+    return row_id
+
+
+async def insert_gm_project_if_absent(
+    project_id: str,
+    project_name: str,
+    repo_path: str,
+    build_command: str | None,
+    test_command: str | None,
+    agent_count: int,
+    started_at: str,
+) -> int | None:
+    """Insert unless `project_id` already exists. Returns the new id or None."""
+    row_id = await _insert(
+        "INSERT OR IGNORE " + _GM_PROJECT_INSERT,
+        (project_id, project_name, repo_path, build_command, test_command,
+         agent_count, started_at),
+    )
+    if row_id is not None:
+        _invalidate_cache()
+    return row_id
 
 
 async def update_gm_project_phase(
@@ -580,18 +1432,11 @@ async def update_gm_project_phase(
     error_message: str | None = None,
     completed_at: str | None = None,
 ) -> None:
-    db = await get_db()
-    if completed_at:
-        await db.execute(
-            "UPDATE gm_projects SET phase = ?, error_message = ?, completed_at = ? WHERE project_id = ?",
-            (phase, error_message, completed_at, project_id),
-        )
-    else:
-        await db.execute(
-            "UPDATE gm_projects SET phase = ?, error_message = ? WHERE project_id = ?",
-            (phase, error_message, project_id),
-        )
-    await db.commit()
+    await _execute(
+        "UPDATE gm_projects SET phase = ?, error_message = ?, "
+        "completed_at = COALESCE(?, completed_at) WHERE project_id = ?",
+        (phase, error_message, completed_at or None, project_id),
+    )
 
 
 async def update_gm_project_merge_progress(
@@ -605,7 +1450,6 @@ async def update_gm_project_merge_progress(
     build_attempts: int | None = None,
     test_attempts: int | None = None,
 ) -> None:
-    db = await get_db()
     updates: list[str] = []
     params: list = []
     for col, val in [
@@ -623,37 +1467,28 @@ async def update_gm_project_merge_progress(
     if not updates:
         return
     params.append(project_id)
-    await db.execute(
+    await _execute(
         f"UPDATE gm_projects SET {', '.join(updates)} WHERE project_id = ?",
         params,
     )
-    await db.commit()
 
 
 async def get_gm_project(project_id: str) -> dict | None:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM gm_projects WHERE project_id = ?", (project_id,)
+    return await _fetchone(
+        "SELECT * FROM gm_projects WHERE project_id = ?", (project_id,),
     )
-    row = await cursor.fetchone()
-    return dict(row) if row else None
 
 
-async def get_gm_projects(limit: int = 50, offset: int = 0) -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM gm_projects ORDER BY started_at DESC LIMIT ? OFFSET ?",
-        (limit, offset),
+async def get_gm_projects(
+    limit: int = 50, offset: int = 0, before: Cursor | None = None,
+) -> list[dict]:
+    return await _fetchall(
+        *_page("SELECT * FROM gm_projects", "started_at", limit, offset, before)
     )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
 
 
 async def get_gm_project_count() -> int:
-    db = await get_db()
-    cursor = await db.execute("SELECT COUNT(*) FROM gm_projects")
-    row = await cursor.fetchone()
-    return row[0]
+    return await _get_counter("gm_projects")
 
 
 async def insert_gm_agent_session(
@@ -662,15 +1497,29 @@ async def insert_gm_agent_session(
     team_name: str,
     task_description: str | None,
 ) -> int:
-    db = await get_db()
-    cursor = await db.execute(
+    return await _insert(
         """INSERT INTO gm_agent_sessions
            (project_id, session_id, team_name, task_description)
-           VALUES (?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?)
+           RETURNING id""",
         (project_id, session_id, team_name, task_description),
     )
-    await db.commit()
-    return cursor.lastrowid
+
+
+async def insert_gm_agent_sessions_many(project_id: str, rows: Iterable[tuple]) -> None:
+    """Insert many GM agent sessions in one transaction.
+
+    Each row is (session_id, team_name, task_description, status).
+    """
+    params = [(project_id, *r) for r in rows]
+    if not params:
+        return
+    await _executemany(
+        """INSERT INTO gm_agent_sessions
+           (project_id, session_id, team_name, task_description, status)
+           VALUES (?, ?, ?, ?, ?)""",
+        params,
+    )
 
 
 async def update_gm_agent_session_status(
@@ -678,12 +1527,10 @@ async def update_gm_agent_session_status(
     session_id: str,
     status: str,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await _execute(
         "UPDATE gm_agent_sessions SET status = ? WHERE project_id = ? AND session_id = ?",
         (status, project_id, session_id),
     )
-    await db.commit()
 
 
 async def update_gm_agent_session_files(
@@ -691,12 +1538,38 @@ async def update_gm_agent_session_files(
     session_id: str,
     files_changed: str,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await _execute(
         "UPDATE gm_agent_sessions SET files_changed = ? WHERE project_id = ? AND session_id = ?",
         (files_changed, project_id, session_id),
     )
-    await db.commit()
+
+
+async def bulk_update_gm_agent_session_status(
+    project_id: str,
+    statuses: Iterable[tuple[str, str]],
+) -> None:
+    """Set many agent statuses in one transaction. Each item is (session_id, status)."""
+    params = [(status, project_id, sid) for sid, status in statuses]
+    if not params:
+        return
+    await _executemany(
+        "UPDATE gm_agent_sessions SET status = ? WHERE project_id = ? AND session_id = ?",
+        params,
+    )
+
+
+async def bulk_update_gm_agent_session_files(
+    project_id: str,
+    files_by_session: dict[str, str],
+) -> None:
+    """Store files_changed JSON for many agents in one transaction."""
+    params = [(files, project_id, sid) for sid, files in files_by_session.items()]
+    if not params:
+        return
+    await _executemany(
+        "UPDATE gm_agent_sessions SET files_changed = ? WHERE project_id = ? AND session_id = ?",
+        params,
+    )
 
 
 async def update_gm_agent_session_merge(
@@ -706,24 +1579,19 @@ async def update_gm_agent_session_merge(
     merge_result: str,
     merged_at: str | None = None,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await _execute(
         """UPDATE gm_agent_sessions
            SET merge_order_index = ?, merge_result = ?, merged_at = ?
            WHERE project_id = ? AND session_id = ?""",
         (merge_order_index, merge_result, merged_at, project_id, session_id),
     )
-    await db.commit()
 
 
 async def get_gm_agent_sessions(project_id: str) -> list[dict]:
-    db = await get_db()
-    cursor = await db.execute(
+    return await _fetchall(
         "SELECT * FROM gm_agent_sessions WHERE project_id = ? ORDER BY id",
         (project_id,),
     )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
 
 
 # ── GM Decisions ──────────────────────────────────────────────────────
@@ -737,20 +1605,18 @@ async def insert_gm_decision(
     context: str | None,
     created_at: str,
 ) -> int:
-    db = await get_db()
     # Truncate context to 4KB
     if context and len(context) > 4096:
         context = context[-4096:]
-    cursor = await db.execute(
+    return await _insert(
         """INSERT INTO gm_decisions
            (decision_id, project_id, decision_type, description,
             proposed_action, context, created_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           RETURNING id""",
         (decision_id, project_id, decision_type, description,
          proposed_action, context, created_at),
     )
-    await db.commit()
-    return cursor.lastrowid
 
 
 async def resolve_gm_decision(
@@ -758,37 +1624,28 @@ async def resolve_gm_decision(
     status: str,
     resolved_at: str,
 ) -> None:
-    db = await get_db()
-    await db.execute(
+    await _execute(
         "UPDATE gm_decisions SET status = ?, resolved_at = ? WHERE decision_id = ?",
         (status, resolved_at, decision_id),
     )
-    await db.commit()
 
 
 async def get_gm_decision(decision_id: str) -> dict | None:
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT * FROM gm_decisions WHERE decision_id = ?", (decision_id,)
+    return await _fetchone(
+        "SELECT * FROM gm_decisions WHERE decision_id = ?", (decision_id,),
     )
-    row = await cursor.fetchone()
-    return dict(row) if row else None
 
 
 async def get_gm_decisions_for_project(
     project_id: str,
     status: str | None = None,
 ) -> list[dict]:
-    db = await get_db()
     if status:
-        cursor = await db.execute(
+        return await _fetchall(
             "SELECT * FROM gm_decisions WHERE project_id = ? AND status = ? ORDER BY created_at DESC",
             (project_id, status),
         )
-    else:
-        cursor = await db.execute(
-            "SELECT * FROM gm_decisions WHERE project_id = ? ORDER BY created_at DESC",
-            (project_id,),
-        )
-    rows = await cursor.fetchall()
-    return [dict(r) for r in rows]
+    return await _fetchall(
+        "SELECT * FROM gm_decisions WHERE project_id = ? ORDER BY created_at DESC",
+        (project_id,),
+    )
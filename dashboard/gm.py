@@ -5,20 +5,22 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import uuid
+import os
+import secrets
+import signal
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Callable, Awaitable
 
-import yaml
-
 from . import config, db
-from .team_launcher import TeamLauncher
+from .team_launcher import TERMINAL_STATUSES, TeamLauncher
 from .worktree import (
     _run_git,
+    commit_worktree_changes,
+    detect_conflicts,
     get_files_changed,
     merge_worktree,
     delete_worktree,
-    BRANCH_PREFIX,
 )
 
 log = logging.getLogger("dashboard.gm")
@@ -26,17 +28,60 @@ log = logging.getLogger("dashboard.gm")
 PHASES = ["launching", "waiting", "analyzing", "merging", "building", "testing", "completed"]
 MAX_BUILD_FIX_ATTEMPTS = 3
 MAX_TEST_FIX_ATTEMPTS = 3
-POLL_INTERVAL = 5  # seconds
+SHELL_TIMEOUT = 300  # seconds per build/test command
+CLAUDE_TIMEOUT = 600  # seconds per Claude task
+OUTPUT_TAIL_BYTES = 4096  # build/test output kept for prompts and events
+CLAUDE_STDERR_CHARS = 500  # leading stderr shown when a Claude run fails
+MAX_CONCURRENT_GIT = 8  # git subprocesses in flight while analyzing
+MAX_PROMPT_CONFLICT_FILES = 50  # paths listed in a conflict-resolution prompt
+CLAUDE_STREAM_LINE_LIMIT = 16 * 1024 * 1024  # one stream-json message per line
+POLL_INTERVAL = 5  # seconds, fallback for sessions the launcher isn't tracking
+
+# Caps build/test shells and Claude runs across all GM projects, so many
+# projects fixing up at once can't fork without bound. git calls are bounded
+# separately (MAX_CONCURRENT_GIT) where they fan out.
+_SUBPROC_SEM = asyncio.Semaphore(min(32, (os.cpu_count() or 1) * 4))
 
 
 ProgressCallback = Callable[[dict], Awaitable[None]]
 
 
-def get_available_gm_projects() -> list[dict]:
+async def _tail(reader: asyncio.StreamReader, n: int = OUTPUT_TAIL_BYTES) -> bytes:
+    """Drain reader to EOF, keeping only the last n bytes."""
+    buf = bytearray()
+    while chunk := await reader.read(65536):
+        buf += chunk
+        if len(buf) > n:
+            del buf[:-n]
+    return bytes(buf)
+
+
+async def _head(reader: asyncio.StreamReader, n: int) -> bytes:
+    """Drain reader to EOF, keeping only the first n bytes."""
+    buf = bytearray()
+    while chunk := await reader.read(65536):
+        if len(buf) < n:
+            buf += chunk[:n - len(buf)]
+    return bytes(buf)
+
+
+def _error_text(stdout: bytes, stderr: bytes) -> str:
+    """Decode the stream worth showing for a failed command (stderr, else stdout).
+
+    A tail can start partway through a UTF-8 character; its leading
+    continuation bytes are skipped rather than decoded as replacements.
+    """
+    out = stderr or stdout
+    start = 0
+    while start < min(3, len(out)) and 0x80 <= out[start] <= 0xBF:
+        start += 1
+    return out[start:].decode("utf-8", errors="replace")
+
+
+async def get_available_gm_projects() -> list[dict]:
     """Read GM project templates from orchestra.yml."""
     try:
-        with open(config.CONFIG_FILE) as f:
-            cfg = yaml.safe_load(f)
+        cfg = await config.load_orchestra_config_async()
     except FileNotFoundError:
         return []
 
@@ -56,6 +101,105 @@ def get_available_gm_projects() -> list[dict]:
     return result
 
 
+class ClaudeSession:
+    """One long-lived `claude` process per project, fed prompts over stream-json.
+
+    Conflict resolution and build/test fixes can spawn Claude up to seven
+    times per project; keeping a single process alive pays the CLI start-up
+    once. Prompts are serialised — each one is written as a user message on
+    stdin and answered by the next `result` message on stdout.
+    """
+
+    def __init__(self, repo_path: str):
+        self._repo_path = repo_path
+        self._proc: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+        self.supported = True  # cleared if the CLI can't hold a stream session
+
+    async def _start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            "claude",
+            "--dangerously-skip-permissions",
+            "--allowedTools", "Edit,Write,Bash,Read,Glob,Grep",
+            "-p",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+            cwd=self._repo_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=CLAUDE_STREAM_LINE_LIMIT,
+        )
+
+    async def _read_result(self) -> dict | None:
+        """Read messages until the turn's `result`; None if the process exits first."""
+        while line := await self._proc.stdout.readline():
+            try:
+                msg = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if msg.get("type") == "result":
+                return msg
+        return None
+
+    async def ask(self, prompt: str, label: str, timeout: float = CLAUDE_TIMEOUT) -> bool | None:
+        """Run one prompt. Returns success, or None if the session is unusable."""
+        async with self._lock, _SUBPROC_SEM:
+            if not self.supported:
+                return None
+            try:
+                if self._proc is None or self._proc.returncode is not None:
+                    await self._start()
+                request = {"type": "user", "message": {"role": "user", "content": prompt}}
+                self._proc.stdin.write(json.dumps(request).encode() + b"\n")
+                await self._proc.stdin.drain()
+                result = await asyncio.wait_for(self._read_result(), timeout=timeout)
+            except asyncio.TimeoutError:
+                log.error("Claude %s timed out", label)
+                await self._kill()
+                return False
+            except (OSError, ValueError) as e:
+                # Spawn failure, broken pipe or an over-long line
+                log.warning("Claude session unusable for %s: %s", label, e)
+                result = None
+
+            if result is None:
+                # Exited without answering: most likely no stream-json support
+                await self._kill()
+                self.supported = False
+                return None
+
+            ok = result.get("subtype") == "success" and not result.get("is_error")
+            if not ok:
+                log.warning("Claude %s failed: %s", label, str(result.get("result", ""))[:500])
+            return ok
+
+    async def _kill(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+
+    async def close(self) -> None:
+        """End the session: close stdin so Claude exits, then make sure it has."""
+        async with self._lock:
+            proc = self._proc
+            if proc is None or proc.returncode is not None:
+                self._proc = None
+                return
+            try:
+                proc.stdin.close()
+                await asyncio.wait_for(proc.wait(), timeout=10)
+                self._proc = None
+            except (OSError, asyncio.TimeoutError):
+                await self._kill()
+
+
 class GeneralManager:
     """Automated multi-agent lifecycle: launch → wait → analyze → merge → build → test → done."""
 
@@ -66,6 +210,7 @@ class GeneralManager:
         self._log_callback: Callable | None = None
         self._pending_decisions: dict[str, asyncio.Event] = {}
         self._decision_results: dict[str, str] = {}  # decision_id → 'approved'|'rejected'
+        self._claude_sessions: dict[str, ClaudeSession] = {}
 
     def set_progress_callback(self, cb: ProgressCallback) -> None:
         self._progress_callback = cb
@@ -93,7 +238,7 @@ class GeneralManager:
         context: str | None = None,
     ) -> bool:
         """Create a decision, broadcast it, and wait for user approval. Returns True if approved."""
-        decision_id = f"{project_id}-{decision_type}-{uuid.uuid4().hex[:6]}"
+        decision_id = f"{project_id}-{decision_type}-{secrets.token_hex(3)}"
         ts = datetime.now(timezone.utc).isoformat()
 
         await db.insert_gm_decision(
@@ -163,8 +308,9 @@ class GeneralManager:
         test_command: str | None = None,
     ) -> dict:
         """Start a GM project: launch all agents, then orchestrate the pipeline."""
-        project_id = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
-        ts = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
+        project_id = now.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+        ts = now.isoformat()
 
         await db.insert_gm_project(
             project_id=project_id,
@@ -182,6 +328,7 @@ class GeneralManager:
 
         # Launch each agent via TeamLauncher
         session_ids = []
+        agent_rows = []
         for agent_def in agents:
             team_name = agent_def.get("team", "unnamed")
             task = agent_def.get("task", "")
@@ -189,17 +336,16 @@ class GeneralManager:
             result = await self._team_launcher.launch(team_name, task, repo_path)
             if "error" in result:
                 await self._log("error", f"Failed to launch agent '{team_name}': {result['error']}")
-                await db.insert_gm_agent_session(project_id, f"failed-{team_name}", team_name, task)
-                await db.update_gm_agent_session_status(project_id, f"failed-{team_name}", "failed")
+                agent_rows.append((f"failed-{team_name}", team_name, task, "failed"))
                 continue
 
             sid = result["session_id"]
             session_ids.append(sid)
-
-            await db.insert_gm_agent_session(project_id, sid, team_name, task)
-            await db.update_gm_agent_session_status(project_id, sid, "running")
+            agent_rows.append((sid, team_name, task, "running"))
             await self._emit(project_id, "agent_launched", session_id=sid, team_name=team_name)
 
+        await db.insert_gm_agent_sessions_many(project_id, agent_rows)
+
         if not session_ids:
             await self._set_phase(project_id, "failed", error_message="No agents launched successfully")
             return {"error": "No agents could be launched", "project_id": project_id}
@@ -260,7 +406,7 @@ class GeneralManager:
                                 context=build_err,
                             )
                             if approved:
-                                fix_ok = await self._fix_build_with_claude(project_id, repo_path, build_command)
+                                fix_ok = await self._fix_build_with_claude(project_id, repo_path, build_command, build_err)
                                 if not fix_ok:
                                     await self._log("warn", f"Build broken after merging {sid}, continuing...")
                             else:
@@ -285,7 +431,7 @@ class GeneralManager:
                         context=build_err,
                     )
                     if approved:
-                        build_ok = await self._fix_build_with_claude(project_id, repo_path, build_command)
+                        build_ok = await self._fix_build_with_claude(project_id, repo_path, build_command, build_err)
                     if not build_ok:
                         await self._set_phase(project_id, "failed", error_message="Build failed after all fix attempts")
                         await self._emit(project_id, "project_failed", reason="Build failed")
@@ -305,7 +451,7 @@ class GeneralManager:
                         context=test_err,
                     )
                     if approved:
-                        test_ok = await self._fix_tests_with_claude(project_id, repo_path, test_command)
+                        test_ok = await self._fix_tests_with_claude(project_id, repo_path, test_command, test_err)
                     if not test_ok:
                         await self._set_phase(project_id, "failed", error_message="Tests failed after all fix attempts")
                         await self._emit(project_id, "project_failed", reason="Tests failed")
@@ -323,44 +469,54 @@ class GeneralManager:
             await self._emit(project_id, "project_failed", reason=str(e))
         finally:
             self._active_projects.pop(project_id, None)
+            await self._close_claude_session(project_id)
 
     # ── Wait for Agents ────────────────────────────────────────────────
 
     async def _wait_for_completion(self, project_id: str, session_ids: list[str]) -> None:
-        """Poll DB every POLL_INTERVAL seconds until all agents finish."""
+        """Wait for every agent to finish, waking as the launcher reports exits.
+
+        Each wake costs one bulk status query. Sessions the launcher isn't
+        tracking fall back to a check every POLL_INTERVAL seconds.
+        """
         await self._set_phase(project_id, "waiting")
         await self._emit(project_id, "phase_change", phase="waiting")
 
-        completed = set()
-        while len(completed) < len(session_ids):
-            await asyncio.sleep(POLL_INTERVAL)
-
-            for sid in session_ids:
-                if sid in completed:
-                    continue
-                session = await db.get_team_session_by_session_id(sid)
-                if not session:
-                    continue
-                status = session.get("status", "running")
-                if status in ("completed", "failed", "cancelled"):
-                    completed.add(sid)
-                    agent_status = "completed" if status == "completed" else "failed"
-                    await db.update_gm_agent_session_status(project_id, sid, agent_status)
-                    await self._emit(
-                        project_id, "agent_completed",
-                        session_id=sid, status=agent_status,
-                    )
-                    await self._log("info", f"Agent {sid} finished: {status}")
-
-            c = len(completed)
-            f = 0
-            for sid in completed:
-                s = await db.get_team_session_by_session_id(sid)
-                if s and s.get("status") == "failed":
-                    f += 1
-            await db.update_gm_project_merge_progress(
-                project_id, completed_count=c, failed_count=f,
-            )
+        pending = set(session_ids)
+        completed_count = 0
+        failed_count = 0
+        while pending:
+            await self._team_launcher.wait_any_terminal(pending, timeout=POLL_INTERVAL)
+
+            done = {
+                s["session_id"]: s["status"]
+                for s in await db.get_team_sessions_by_ids(pending)
+                if s.get("status") in TERMINAL_STATUSES
+            }
+            if not done:
+                continue
+
+            agent_statuses = [
+                (sid, "completed" if status == "completed" else "failed")
+                for sid, status in done.items()
+            ]
+            completed_count += len(done)
+            failed_count += sum(1 for status in done.values() if status == "failed")
+
+            # One commit for every status change seen this wake
+            async with db.transaction():
+                await db.bulk_update_gm_agent_session_status(project_id, agent_statuses)
+                await db.update_gm_project_merge_progress(
+                    project_id, completed_count=completed_count, failed_count=failed_count,
+                )
+            pending -= done.keys()
+
+            for sid, agent_status in agent_statuses:
+                await self._emit(
+                    project_id, "agent_completed",
+                    session_id=sid, status=agent_status,
+                )
+                await self._log("info", f"Agent {sid} finished: {done[sid]}")
 
     # ── Analyze Merge Order ────────────────────────────────────────────
 
@@ -372,37 +528,52 @@ class GeneralManager:
         await self._emit(project_id, "phase_change", phase="analyzing")
 
         # Filter to only completed agents
-        successful = []
-        for sid in session_ids:
-            session = await db.get_team_session_by_session_id(sid)
-            if session and session.get("status") == "completed":
-                successful.append(sid)
+        statuses = {
+            s["session_id"]: s.get("status")
+            for s in await db.get_team_sessions_by_ids(session_ids)
+        }
+        successful = [sid for sid in session_ids if statuses.get(sid) == "completed"]
 
         if not successful:
             return []
 
-        # Gather files changed per branch
+        # Gather files changed per branch; the git calls are independent, so
+        # run them concurrently, a bounded number at a time
+        sem = asyncio.Semaphore(MAX_CONCURRENT_GIT)
+
+        async def files_changed(sid: str) -> list[str]:
+            async with sem:
+                return await get_files_changed(repo_path, sid)
+
+        results = await asyncio.gather(
+            *(files_changed(sid) for sid in successful), return_exceptions=True,
+        )
         files_by_branch: dict[str, set[str]] = {}
-        for sid in successful:
-            files = await get_files_changed(repo_path, sid)
+        files_json: dict[str, str] = {}
+        for sid, files in zip(successful, results):
+            if isinstance(files, BaseException):
+                log.warning("Failed to list files changed for %s: %s", sid, files)
+                files = []
             files_by_branch[sid] = set(files)
-            await db.update_gm_agent_session_files(
-                project_id, sid, json.dumps(files),
-            )
+            files_json[sid] = json.dumps(files)
+        await db.bulk_update_gm_agent_session_files(project_id, files_json)
 
-        # Score: count of files that overlap with ANY other branch
-        overlap_scores: dict[str, int] = {}
         all_sids = list(files_by_branch.keys())
-        for sid in all_sids:
-            score = 0
-            for other_sid in all_sids:
-                if other_sid == sid:
-                    continue
-                score += len(files_by_branch[sid] & files_by_branch[other_sid])
-            overlap_scores[sid] = score
-
-        # Sort ascending (least overlap first)
-        merge_order = sorted(all_sids, key=lambda s: overlap_scores[s])
+        touch_counts = Counter(f for files in files_by_branch.values() for f in files)
+        if len(all_sids) <= 1 or len(touch_counts) == sum(map(len, files_by_branch.values())):
+            # One branch, or no file touched twice: nothing overlaps, keep launch order
+            overlap_scores = dict.fromkeys(all_sids, 0)
+            merge_order = all_sids
+        else:
+            # Score: sum of pairwise file overlaps with every other branch. A
+            # file touched by k branches adds k - 1 to each of them, so one
+            # pass over the per-file branch count replaces pairwise intersections.
+            overlap_scores = {
+                sid: sum(touch_counts[f] for f in files) - len(files)
+                for sid, files in files_by_branch.items()
+            }
+            # Sort ascending (least overlap first)
+            merge_order = sorted(all_sids, key=lambda s: overlap_scores[s])
 
         await db.update_gm_project_merge_progress(
             project_id, merge_order=json.dumps(merge_order),
@@ -425,19 +596,30 @@ class GeneralManager:
         await db.update_gm_project_merge_progress(project_id, current_merge=session_id)
         await self._emit(project_id, "merge_started", session_id=session_id, index=index)
 
-        branch = f"{BRANCH_PREFIX}/{session_id}"
         ts = datetime.now(timezone.utc).isoformat()
 
-        # Try merge
-        result = await merge_worktree(repo_path, session_id)
-        if "error" not in result:
-            await db.update_gm_agent_session_merge(project_id, session_id, index, "merged", ts)
-            await self._emit(project_id, "merge_completed", session_id=session_id)
-            await self._log("info", f"Merged {session_id} successfully")
-            return {"ok": True}
+        # Pre-flight the merge in memory so a conflict costs no working-tree
+        # writes and, if the user declines, no merge --abort
+        await commit_worktree_changes(repo_path, session_id)
+        clean, conflict_files = await detect_conflicts(repo_path, session_id)
+
+        if clean:
+            result = await merge_worktree(repo_path, session_id, commit_first=False)
+            if "error" not in result:
+                await db.update_gm_agent_session_merge(project_id, session_id, index, "merged", ts)
+                await self._emit(project_id, "merge_completed", session_id=session_id)
+                await self._log("info", f"Merged {session_id} successfully")
+                return {"ok": True}
+            # merge-tree couldn't tell, and the real merge stopped on conflicts
+            conflict_error = result.get("error", "")
+            rc, out, _ = await _run_git("diff", "--name-only", "--diff-filter=U", "-z", cwd=repo_path)
+            conflict_files = [f for f in out.split("\0") if f] if rc == 0 else []
+            merging = True
+        else:
+            conflict_error = "Conflicting files:\n" + "\n".join(conflict_files)
+            merging = False
 
         # Merge conflict — request approval before resolving with Claude
-        conflict_error = result.get("error", "")
         await self._emit(project_id, "merge_conflict", session_id=session_id, error=conflict_error)
         await self._log("warn", f"Merge conflict for {session_id}: {conflict_error}")
 
@@ -449,53 +631,55 @@ class GeneralManager:
             context=conflict_error,
         )
 
-        if not approved:
-            await _run_git("merge", "--abort", cwd=repo_path)
-            await delete_worktree(repo_path, session_id)
-            await db.update_gm_agent_session_merge(project_id, session_id, index, "skipped", ts)
-            await self._emit(project_id, "merge_completed", session_id=session_id, skipped=True)
-            await self._log("info", f"Skipped {session_id} (user rejected conflict resolution)")
-            return {"error": "User rejected conflict resolution", "skipped": True}
-
-        resolve_result = await self._resolve_conflicts_with_claude(project_id, session_id, repo_path)
-        if resolve_result.get("ok"):
-            await db.update_gm_agent_session_merge(project_id, session_id, index, "merged_resolved", ts)
-            await self._emit(project_id, "conflict_resolved", session_id=session_id)
-            return {"ok": True}
+        if approved:
+            if not merging:
+                # Run the real merge so the conflict markers land in the tree
+                await merge_worktree(repo_path, session_id, commit_first=False)
+                merging = True
+            resolve_result = await self._resolve_conflicts_with_claude(
+                project_id, session_id, repo_path, conflict_files,
+            )
+            if resolve_result.get("ok"):
+                await db.update_gm_agent_session_merge(project_id, session_id, index, "merged_resolved", ts)
+                await self._emit(project_id, "conflict_resolved", session_id=session_id)
+                return {"ok": True}
 
-        # Failed to resolve — abort and skip
-        await _run_git("merge", "--abort", cwd=repo_path)
+        if merging:
+            await _run_git("merge", "--abort", cwd=repo_path)
         await delete_worktree(repo_path, session_id)
         await db.update_gm_agent_session_merge(project_id, session_id, index, "skipped", ts)
         await self._emit(project_id, "merge_completed", session_id=session_id, skipped=True)
+        if not approved:
+            await self._log("info", f"Skipped {session_id} (user rejected conflict resolution)")
+            return {"error": "User rejected conflict resolution", "skipped": True}
         await self._log("warn", f"Skipped {session_id} (could not resolve conflicts)")
         return {"error": "Conflict resolution failed", "skipped": True}
 
     async def _resolve_conflicts_with_claude(
-        self, project_id: str, session_id: str, repo_path: str,
+        self, project_id: str, session_id: str, repo_path: str, conflict_files: list[str],
     ) -> dict:
-        """Spawn claude -p to resolve merge conflicts."""
-        # Get list of conflicted files
-        rc, out, _ = await _run_git("diff", "--name-only", "--diff-filter=U", cwd=repo_path)
-        if rc != 0 or not out.strip():
+        """Spawn claude -p to resolve merge conflicts in conflict_files."""
+        if not conflict_files:
             return {"error": "Could not determine conflicted files"}
 
-        conflict_files = out.strip()
+        conflict_list = "\n".join(conflict_files[:MAX_PROMPT_CONFLICT_FILES])
+        if len(conflict_files) > MAX_PROMPT_CONFLICT_FILES:
+            conflict_list += f"\n... and {len(conflict_files) - MAX_PROMPT_CONFLICT_FILES} more"
         prompt = (
-            f"There are merge conflicts in the following files:\n{conflict_files}\n\n"
+            f"There are merge conflicts in {len(conflict_files)} files:\n{conflict_list}\n\n"
             "Please resolve all merge conflicts in these files. Keep the best version of each "
             "conflicting section, combining changes from both sides where appropriate. "
             "Remove all conflict markers (<<<<<<<, =======, >>>>>>>). "
             "After resolving, stage the files with git add."
         )
 
-        ok = await self._run_claude(repo_path, prompt, f"conflict-resolution-{session_id}")
+        ok = await self._run_claude(project_id, repo_path, prompt, f"conflict-resolution-{session_id}")
         if not ok:
             return {"error": "Claude failed to resolve conflicts"}
 
         # Check if conflicts are resolved
-        rc, remaining, _ = await _run_git("diff", "--name-only", "--diff-filter=U", cwd=repo_path)
-        if rc == 0 and remaining.strip():
+        rc, remaining, _ = await _run_git("ls-files", "--unmerged", "-z", cwd=repo_path)
+        if rc == 0 and remaining:
             return {"error": "Conflicts still remain after Claude resolution"}
 
         # Commit the resolution
@@ -519,22 +703,24 @@ class GeneralManager:
 
         rc, stdout, stderr = await self._run_shell(build_command, repo_path)
         ok = rc == 0
-        error_output = (stderr or stdout)[-4096:] if not ok else ""
+        error_output = _error_text(stdout, stderr) if not ok else ""
 
         await self._emit(project_id, "build_result", success=ok, output=error_output)
         return ok, error_output
 
-    async def _fix_build_with_claude(self, project_id: str, repo_path: str, build_command: str) -> bool:
-        """Try to fix build errors with Claude, up to MAX_BUILD_FIX_ATTEMPTS."""
+    async def _fix_build_with_claude(
+        self, project_id: str, repo_path: str, build_command: str, error_output: str,
+    ) -> bool:
+        """Try to fix build errors with Claude, up to MAX_BUILD_FIX_ATTEMPTS.
+
+        error_output comes from the build that just failed, so the first
+        prompt doesn't need another run.
+        """
         for attempt in range(1, MAX_BUILD_FIX_ATTEMPTS + 1):
             await db.update_gm_project_merge_progress(project_id, build_attempts=attempt)
             await self._emit(project_id, "build_fix_attempt", attempt=attempt)
             await self._log("info", f"Build fix attempt {attempt}/{MAX_BUILD_FIX_ATTEMPTS}")
 
-            # Get the build error
-            rc, stdout, stderr = await self._run_shell(build_command, repo_path)
-            error_output = (stderr or stdout)[-4096:]
-
             prompt = (
                 f"The build command `{build_command}` failed with the following errors:\n\n"
                 f"```\n{error_output}\n```\n\n"
@@ -542,7 +728,7 @@ class GeneralManager:
                 "test expectations or add new features. Make minimal changes to get the build passing."
             )
 
-            ok = await self._run_claude(repo_path, prompt, f"build-fix-{attempt}")
+            ok = await self._run_claude(project_id, repo_path, prompt, f"build-fix-{attempt}")
             if not ok:
                 continue
 
@@ -552,12 +738,14 @@ class GeneralManager:
                 "commit", "-m", f"fix: build fix attempt {attempt}", cwd=repo_path,
             )
 
-            # Re-run build
-            rc, _, _ = await self._run_shell(build_command, repo_path)
+            # Re-run build; a failure here seeds the next attempt's prompt
+            rc, stdout, stderr = await self._run_shell(build_command, repo_path)
             if rc == 0:
                 await self._emit(project_id, "build_result", success=True)
                 return True
 
+            error_output = _error_text(stdout, stderr)
+
         return False
 
     # ── Tests ──────────────────────────────────────────────────────────
@@ -568,22 +756,24 @@ class GeneralManager:
 
         rc, stdout, stderr = await self._run_shell(test_command, repo_path)
         ok = rc == 0
-        error_output = (stderr or stdout)[-4096:] if not ok else ""
+        error_output = _error_text(stdout, stderr) if not ok else ""
 
         await self._emit(project_id, "test_result", success=ok, output=error_output)
         return ok, error_output
 
-    async def _fix_tests_with_claude(self, project_id: str, repo_path: str, test_command: str) -> bool:
-        """Try to fix test failures with Claude, up to MAX_TEST_FIX_ATTEMPTS."""
+    async def _fix_tests_with_claude(
+        self, project_id: str, repo_path: str, test_command: str, error_output: str,
+    ) -> bool:
+        """Try to fix test failures with Claude, up to MAX_TEST_FIX_ATTEMPTS.
+
+        error_output comes from the test run that just failed, so the first
+        prompt doesn't need another run.
+        """
         for attempt in range(1, MAX_TEST_FIX_ATTEMPTS + 1):
             await db.update_gm_project_merge_progress(project_id, test_attempts=attempt)
             await self._emit(project_id, "test_fix_attempt", attempt=attempt)
             await self._log("info", f"Test fix attempt {attempt}/{MAX_TEST_FIX_ATTEMPTS}")
 
-            # Get the test error
-            rc, stdout, stderr = await self._run_shell(test_command, repo_path)
-            error_output = (stderr or stdout)[-4096:]
-
             prompt = (
                 f"The test command `{test_command}` failed with the following output:\n\n"
                 f"```\n{error_output}\n```\n\n"
@@ -591,7 +781,7 @@ class GeneralManager:
                 "fix the actual implementation code. Make minimal changes."
             )
 
-            ok = await self._run_claude(repo_path, prompt, f"test-fix-{attempt}")
+            ok = await self._run_claude(project_id, repo_path, prompt, f"test-fix-{attempt}")
             if not ok:
                 continue
 
@@ -601,12 +791,14 @@ class GeneralManager:
                 "commit", "-m", f"fix: test fix attempt {attempt}", cwd=repo_path,
             )
 
-            # Re-run tests
-            rc, _, _ = await self._run_shell(test_command, repo_path)
+            # Re-run tests; a failure here seeds the next attempt's prompt
+            rc, stdout, stderr = await self._run_shell(test_command, repo_path)
             if rc == 0:
                 await self._emit(project_id, "test_result", success=True)
                 return True
 
+            error_output = _error_text(stdout, stderr)
+
         return False
 
     # ── Finalize ───────────────────────────────────────────────────────
@@ -650,9 +842,14 @@ class GeneralManager:
         return {"ok": True, "project_id": project_id}
 
     async def cancel_all(self) -> None:
-        """Cancel all active GM projects (for shutdown)."""
-        for pid in list(self._active_projects.keys()):
-            await self.cancel_project(pid)
+        """Cancel all active GM projects (for shutdown), concurrently."""
+        results = await asyncio.gather(
+            *(self.cancel_project(pid) for pid in list(self._active_projects)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                log.error("Failed to cancel GM project: %s", result)
 
     # ── Push ───────────────────────────────────────────────────────────
 
@@ -682,43 +879,46 @@ class GeneralManager:
         build_command = project.get("build_command")
         test_command = project.get("test_command")
 
-        # Get skipped sessions
-        sessions = await db.get_gm_agent_sessions(project_id)
-        skipped = [s for s in sessions if s.get("merge_result") == "skipped"]
-
-        if skipped:
-            # Re-attempt merges for skipped branches
-            await self._set_phase(project_id, "merging")
-            merged_count = project.get("merged_count", 0)
-            for s in skipped:
-                result = await self._merge_branch(
-                    project_id, s["session_id"], repo_path, s.get("merge_order_index", 0),
-                )
-                if result.get("ok"):
-                    merged_count += 1
-                    await db.update_gm_project_merge_progress(project_id, merged_count=merged_count)
+        try:
+            # Get skipped sessions
+            sessions = await db.get_gm_agent_sessions(project_id)
+            skipped = [s for s in sessions if s.get("merge_result") == "skipped"]
+
+            if skipped:
+                # Re-attempt merges for skipped branches
+                await self._set_phase(project_id, "merging")
+                merged_count = project.get("merged_count", 0)
+                for s in skipped:
+                    result = await self._merge_branch(
+                        project_id, s["session_id"], repo_path, s.get("merge_order_index", 0),
+                    )
+                    if result.get("ok"):
+                        merged_count += 1
+                        await db.update_gm_project_merge_progress(project_id, merged_count=merged_count)
 
-        # Re-attempt build/test
-        if build_command:
-            await self._set_phase(project_id, "building")
-            build_ok, _ = await self._run_build(project_id, repo_path, build_command)
-            if not build_ok:
-                build_ok = await self._fix_build_with_claude(project_id, repo_path, build_command)
+            # Re-attempt build/test
+            if build_command:
+                await self._set_phase(project_id, "building")
+                build_ok, build_err = await self._run_build(project_id, repo_path, build_command)
                 if not build_ok:
-                    await self._set_phase(project_id, "failed", error_message="Build still failing on retry")
-                    return {"error": "Build failed on retry"}
-
-        if test_command:
-            await self._set_phase(project_id, "testing")
-            test_ok, _ = await self._run_tests(project_id, repo_path, test_command)
-            if not test_ok:
-                test_ok = await self._fix_tests_with_claude(project_id, repo_path, test_command)
+                    build_ok = await self._fix_build_with_claude(project_id, repo_path, build_command, build_err)
+                    if not build_ok:
+                        await self._set_phase(project_id, "failed", error_message="Build still failing on retry")
+                        return {"error": "Build failed on retry"}
+
+            if test_command:
+                await self._set_phase(project_id, "testing")
+                test_ok, test_err = await self._run_tests(project_id, repo_path, test_command)
                 if not test_ok:
-                    await self._set_phase(project_id, "failed", error_message="Tests still failing on retry")
-                    return {"error": "Tests failed on retry"}
+                    test_ok = await self._fix_tests_with_claude(project_id, repo_path, test_command, test_err)
+                    if not test_ok:
+                        await self._set_phase(project_id, "failed", error_message="Tests still failing on retry")
+                        return {"error": "Tests failed on retry"}
 
-        await self._finalize(project_id)
-        return {"ok": True, "project_id": project_id}
+            await self._finalize(project_id)
+            return {"ok": True, "project_id": project_id}
+        finally:
+            await self._close_claude_session(project_id)
 
     # ── Helpers ─────────────────────────────────────────────────────────
 
@@ -728,9 +928,33 @@ class GeneralManager:
         ts = datetime.now(timezone.utc).isoformat() if phase in ("completed", "failed") else None
         await db.update_gm_project_phase(project_id, phase, error_message, ts)
 
-    async def _run_claude(self, repo_path: str, prompt: str, label: str) -> bool:
+    async def _run_claude(self, project_id: str, repo_path: str, prompt: str, label: str) -> bool:
+        """Run an intelligent task on the project's Claude session. Returns True on success.
+
+        Falls back to a one-shot `claude -p` if a stream session can't be held.
+        """
+        session = self._claude_sessions.get(project_id)
+        if session is None:
+            session = self._claude_sessions[project_id] = ClaudeSession(repo_path)
+        if session.supported:
+            log.info("Sending %s to Claude session for %s", label, project_id)
+            ok = await session.ask(prompt, label)
+            if ok is not None:
+                return ok
+        return await self._run_claude_once(repo_path, prompt, label)
+
+    async def _close_claude_session(self, project_id: str) -> None:
+        session = self._claude_sessions.pop(project_id, None)
+        if session is not None:
+            await session.close()
+
+    async def _run_claude_once(self, repo_path: str, prompt: str, label: str) -> bool:
         """Spawn a claude -p subprocess for an intelligent task. Returns True if exit code 0."""
         log.info("Spawning Claude for %s", label)
+        async with _SUBPROC_SEM:
+            return await self._spawn_claude(repo_path, prompt, label)
+
+    async def _spawn_claude(self, repo_path: str, prompt: str, label: str) -> bool:
         try:
             proc = await asyncio.create_subprocess_exec(
                 "claude",
@@ -738,36 +962,61 @@ class GeneralManager:
                 "--allowedTools", "Edit,Write,Bash,Read,Glob,Grep",
                 "-p", prompt,
                 cwd=repo_path,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=600)
+            stderr, _ = await asyncio.wait_for(
+                # Up to 4 bytes per character, so the first CLAUDE_STDERR_CHARS fit
+                asyncio.gather(_head(proc.stderr, CLAUDE_STDERR_CHARS * 4), proc.wait()),
+                timeout=CLAUDE_TIMEOUT,
+            )
             ok = proc.returncode == 0
             if not ok:
-                log.warning("Claude %s failed (exit %d): %s", label, proc.returncode, stderr.decode()[:500])
+                log.warning(
+                    "Claude %s failed (exit %d): %s",
+                    label, proc.returncode,
+                    stderr.decode("utf-8", errors="replace")[:CLAUDE_STDERR_CHARS],
+                )
             return ok
         except asyncio.TimeoutError:
             log.error("Claude %s timed out", label)
             try:
                 proc.kill()
-            except Exception:
+            except ProcessLookupError:
                 pass
+            await proc.wait()
             return False
         except OSError as e:
             log.error("Failed to spawn Claude for %s: %s", label, e)
             return False
 
-    async def _run_shell(self, command: str, cwd: str) -> tuple[int, str, str]:
-        """Run a shell command, return (returncode, stdout, stderr)."""
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            cwd=cwd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=300)
-        return (
-            proc.returncode,
-            stdout.decode("utf-8", errors="replace"),
-            stderr.decode("utf-8", errors="replace"),
-        )
+    async def _run_shell(self, command: str, cwd: str) -> tuple[int, bytes, bytes]:
+        """Run a shell command, return (returncode, stdout tail, stderr tail).
+
+        Only the last OUTPUT_TAIL_BYTES of each stream are kept — enough for
+        the error excerpt, without buffering a full compile log. Tails stay
+        raw; _error_text() decodes the one a caller actually uses.
+        """
+        async with _SUBPROC_SEM:
+            # Own process group, so a timeout kills the build's children too
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+            try:
+                stdout, stderr, _ = await asyncio.wait_for(
+                    asyncio.gather(_tail(proc.stdout), _tail(proc.stderr), proc.wait()),
+                    timeout=SHELL_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                log.error("Command timed out after %ds: %s", SHELL_TIMEOUT, command)
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+                return 124, b"", f"Command timed out after {SHELL_TIMEOUT}s: {command}".encode()
+        return proc.returncode, stdout, stderr
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AgentResultModel(BaseModel):
@@ -30,7 +30,7 @@ class ExecutionModel(BaseModel):
 
 
 class ExecutionDetailModel(ExecutionModel):
-    results: list[AgentResultModel] = []
+    results: list[AgentResultModel] = Field(default_factory=list)
 
 
 class AgentSummary(BaseModel):
@@ -53,9 +53,9 @@ class StatsModel(BaseModel):
 
 class CostBreakdown(BaseModel):
     total_cost: float = 0.0
-    by_mode: dict[str, float] = {}
-    by_agent: dict[str, float] = {}
-    by_date: dict[str, float] = {}
+    by_mode: dict[str, float] = Field(default_factory=dict)
+    by_agent: dict[str, float] = Field(default_factory=dict)
+    by_date: dict[str, float] = Field(default_factory=dict)
 
 
 class OrchestratorStatus(BaseModel):
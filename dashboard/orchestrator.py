@@ -12,6 +12,10 @@ from . import config
 
 log = logging.getLogger("dashboard.orchestrator")
 
+LOG_READ_CHUNK = 65536   # bytes per read from the binary's stdout/stderr
+LOG_FLUSH_INTERVAL = 0.05  # seconds between batched log flushes
+LOG_FLUSH_LINES = 200    # flush early once this many lines are pending
+
 
 class OrchestratorControl:
     """Manage the agent-orchestra Rust binary as a subprocess."""
@@ -22,6 +26,9 @@ class OrchestratorControl:
         self._client_mode: str | None = None
         self._started_at: str | None = None
         self._log_callback = None
+        self._log_batch_callback = None
+        # Environment snapshot taken once; each launch layers its mode on top
+        self._env_base = os.environ.copy()
 
     @property
     def running(self) -> bool:
@@ -44,10 +51,21 @@ class OrchestratorControl:
         """Set async callback for log lines: callback(level, message)."""
         self._log_callback = callback
 
+    def set_log_batch_callback(self, callback):
+        """Set async callback for batches of output lines: callback([(level, message), ...])."""
+        self._log_batch_callback = callback
+
     async def _emit_log(self, level: str, message: str):
         if self._log_callback:
             await self._log_callback(level, message)
 
+    async def _emit_logs(self, lines: list[tuple[str, str]]):
+        if self._log_batch_callback:
+            await self._log_batch_callback(lines)
+        else:
+            for level, message in lines:
+                await self._emit_log(level, message)
+
     async def start(self, mode: str = "auto", client_mode: str = "hybrid") -> dict:
         if self.running:
             return {"error": "Orchestrator is already running", **self.status()}
@@ -56,9 +74,7 @@ class OrchestratorControl:
         if not os.path.isfile(binary):
             return {"error": f"Binary not found: {binary}"}
 
-        env = os.environ.copy()
-        env["ORCHESTRATOR_MODE"] = mode
-        env["CLIENT_MODE"] = client_mode
+        env = self._env_base | {"ORCHESTRATOR_MODE": mode, "CLIENT_MODE": client_mode}
 
         self._mode = mode
         self._client_mode = client_mode
@@ -107,20 +123,57 @@ class OrchestratorControl:
         return {"ok": True, "exit_code": code}
 
     async def _stream_output(self):
-        """Read stdout/stderr and forward to log callback."""
+        """Read stdout/stderr in chunks and forward lines to the log callback in batches."""
         if not self._process:
             return
 
-        async def _read_stream(stream, level):
-            while True:
-                line = await stream.readline()
-                if not line:
-                    break
+        pending: list[tuple[str, str]] = []
+        eof = asyncio.Event()
+
+        def _collect(data: bytes | bytearray, level: str):
+            for line in data.split(b"\n"):
                 text = line.decode("utf-8", errors="replace").rstrip()
                 if text:
-                    await self._emit_log(level, text)
+                    pending.append((level, text))
 
-        await asyncio.gather(
-            _read_stream(self._process.stdout, "info"),
-            _read_stream(self._process.stderr, "error"),
-        )
+        async def _flush():
+            if pending:
+                batch = pending[:]
+                pending.clear()
+                await self._emit_logs(batch)
+
+        async def _read_stream(stream, level):
+            buf = bytearray()
+            while True:
+                chunk = await stream.read(LOG_READ_CHUNK)
+                if not chunk:
+                    break
+                buf += chunk
+                # Complete lines go out; a trailing partial line waits for more
+                end = buf.rfind(b"\n")
+                if end >= 0:
+                    _collect(buf[:end], level)
+                    del buf[:end + 1]
+                    if len(pending) >= LOG_FLUSH_LINES:
+                        await _flush()
+            _collect(buf, level)
+
+        async def _flush_periodically():
+            while not eof.is_set():
+                try:
+                    await asyncio.wait_for(eof.wait(), LOG_FLUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                await _flush()
+
+        flusher = asyncio.create_task(_flush_periodically())
+        try:
+            await asyncio.gather(
+                _read_stream(self._process.stdout, "info"),
+                _read_stream(self._process.stderr, "error"),
+            )
+        finally:
+            eof.set()
+            await flusher
+            # Lines collected while the flusher's last callback was running
+            await _flush()
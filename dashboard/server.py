@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import asyncio
+import codecs
+import hashlib
 import json
 import logging
+import os
+import sys
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-import yaml
+try:
+    import orjson
+except ImportError:  # optional: stdlib json produces the same compact text
+    orjson = None
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
@@ -22,162 +31,152 @@ from .team_launcher import TeamLauncher, get_available_teams
 from .watcher import backfill_existing_outputs, backfill_team_outputs, watch_outputs
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+# The format above uses none of the thread/process/task fields, so skip
+# collecting them for every record
+logging.logThreads = logging.logProcesses = logging.logMultiprocessing = False
+logging.logAsyncioTasks = False  # 3.12+; unused attribute before that
 log = logging.getLogger("dashboard.server")
 
 
 # ── WebSocket Connection Manager ────────────────────────────────────────
 
+def _encode_frame(data: dict) -> str:
+    """Compact JSON text for a WebSocket frame, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
 class ConnectionManager:
     """Manage WebSocket connections for real-time updates."""
 
-    HEARTBEAT_INTERVAL = 30  # seconds between pings
-    HEARTBEAT_TIMEOUT = 10   # seconds to wait for pong
+    SEND_QUEUE_SIZE = 1000   # frames buffered per client before the oldest is dropped
 
     def __init__(self):
-        self._status_connections: list[WebSocket] = []
-        self._log_connections: list[WebSocket] = []
-        self._teams_connections: list[WebSocket] = []
-        self._gm_connections: list[WebSocket] = []
-        self._all_connections: set[WebSocket] = set()
-        self._heartbeat_task: asyncio.Task | None = None
-
-    async def connect_status(self, ws: WebSocket):
-        await ws.accept()
-        self._status_connections.append(ws)
-        self._all_connections.add(ws)
-
-    async def connect_logs(self, ws: WebSocket):
+        self._status_connections: set[WebSocket] = set()
+        self._log_connections: set[WebSocket] = set()
+        self._teams_connections: set[WebSocket] = set()
+        self._gm_connections: set[WebSocket] = set()
+        # Each client gets an outbound queue drained by its own writer task,
+        # so broadcasting never waits on a socket
+        self._queues: dict[WebSocket, asyncio.Queue[str]] = {}
+        self._writers: dict[WebSocket, asyncio.Task] = {}
+        # Clients that asked for some topics only (log source, team session
+        # id) sit in these per-topic sets instead of the channel set
+        self._log_subscriptions: dict[str, set[WebSocket]] = {}
+        self._teams_subscriptions: dict[str, set[WebSocket]] = {}
+        self._topics: dict[WebSocket, tuple[dict[str, set[WebSocket]], frozenset[str]]] = {}
+
+    async def _accept(
+        self,
+        ws: WebSocket,
+        channel: set[WebSocket],
+        subscriptions: dict[str, set[WebSocket]] | None = None,
+        topics: frozenset[str] = frozenset(),
+    ):
         await ws.accept()
-        self._log_connections.append(ws)
-        self._all_connections.add(ws)
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.SEND_QUEUE_SIZE)
+        self._queues[ws] = queue
+        self._writers[ws] = asyncio.create_task(self._writer(ws, queue))
+        if subscriptions is not None and topics:
+            for topic in topics:
+                subscriptions.setdefault(topic, set()).add(ws)
+            self._topics[ws] = (subscriptions, topics)
+        else:
+            channel.add(ws)
+
+    async def _writer(self, ws: WebSocket, queue: asyncio.Queue[str]):
+        """Drain one client's queue onto its socket; detach it on the first failure."""
+        try:
+            while True:
+                await ws.send_text(await queue.get())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._writers.pop(ws, None)
+            self.disconnect(ws)
+
+    def _enqueue(self, ws: WebSocket, text: str):
+        queue = self._queues.get(ws)
+        if queue is None:
+            return
+        if queue.full():
+            # Slow client: drop its oldest frame rather than stall everyone
+            queue.get_nowait()
+        queue.put_nowait(text)
 
-    async def connect_teams(self, ws: WebSocket):
-        await ws.accept()
-        self._teams_connections.append(ws)
-        self._all_connections.add(ws)
-
-    def _remove_connection(self, ws: WebSocket):
-        """Remove a connection from all tracking lists."""
-        if ws in self._status_connections:
-            self._status_connections.remove(ws)
-        if ws in self._log_connections:
-            self._log_connections.remove(ws)
-        if ws in self._teams_connections:
-            self._teams_connections.remove(ws)
-        if ws in self._gm_connections:
-            self._gm_connections.remove(ws)
-        self._all_connections.discard(ws)
+    async def connect_status(self, ws: WebSocket):
+        await self._accept(ws, self._status_connections)
+
+    async def connect_logs(self, ws: WebSocket, sources: frozenset[str] = frozenset()):
+        """Subscribe to log entries, only those from `sources` if given."""
+        await self._accept(ws, self._log_connections, self._log_subscriptions, sources)
+
+    async def connect_teams(self, ws: WebSocket, session_ids: frozenset[str] = frozenset()):
+        """Subscribe to team events, only those for `session_ids` if given."""
+        await self._accept(ws, self._teams_connections, self._teams_subscriptions, session_ids)
+
+    def disconnect(self, ws: WebSocket):
+        """Remove a connection from every channel and stop its writer."""
+        self._status_connections.discard(ws)
+        self._log_connections.discard(ws)
+        self._teams_connections.discard(ws)
+        self._gm_connections.discard(ws)
+        subscriptions, topics = self._topics.pop(ws, ({}, frozenset()))
+        for topic in topics:
+            subscribers = subscriptions.get(topic)
+            if subscribers is not None:
+                subscribers.discard(ws)
+                if not subscribers:
+                    del subscriptions[topic]
+        self._queues.pop(ws, None)
+        writer = self._writers.pop(ws, None)
+        if writer is not None:
+            writer.cancel()
 
     async def connect_gm(self, ws: WebSocket):
-        await ws.accept()
-        self._gm_connections.append(ws)
-        self._all_connections.add(ws)
-
-    def disconnect_status(self, ws: WebSocket):
-        if ws in self._status_connections:
-            self._status_connections.remove(ws)
-        self._all_connections.discard(ws)
-
-    def disconnect_logs(self, ws: WebSocket):
-        if ws in self._log_connections:
-            self._log_connections.remove(ws)
-        self._all_connections.discard(ws)
-
-    def disconnect_teams(self, ws: WebSocket):
-        if ws in self._teams_connections:
-            self._teams_connections.remove(ws)
-        self._all_connections.discard(ws)
-
-    def disconnect_gm(self, ws: WebSocket):
-        if ws in self._gm_connections:
-            self._gm_connections.remove(ws)
-        self._all_connections.discard(ws)
+        await self._accept(ws, self._gm_connections)
+
+    @staticmethod
+    def _with_topic(
+        channel: set[WebSocket], subscriptions: dict[str, set[WebSocket]], topic: str | None,
+    ) -> set[WebSocket]:
+        """Unfiltered clients of a channel plus those subscribed to topic."""
+        subscribers = subscriptions.get(topic) if topic is not None else None
+        return channel | subscribers if subscribers else channel
+
+    def _fanout(self, conns: set[WebSocket], data: dict) -> None:
+        """Queue data for every socket in conns.
+
+        The payload is encoded once (same compact form as send_json) and
+        still goes out as a text frame; each client's writer task sends it,
+        so one slow client doesn't hold up the rest or the caller.
+        """
+        if not conns:
+            return
+        text = _encode_frame(data)
+        for ws in conns:
+            self._enqueue(ws, text)
 
     async def broadcast_status(self, data: dict):
-        dead = []
-        for ws in self._status_connections:
-            try:
-                await ws.send_json(data)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect_status(ws)
+        self._fanout(self._status_connections, data)
 
     async def broadcast_log(self, entry: dict):
-        dead = []
-        for ws in self._log_connections:
-            try:
-                await ws.send_json(entry)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect_logs(ws)
+        # Single entries and log_batch frames both carry their source
+        self._fanout(
+            self._with_topic(self._log_connections, self._log_subscriptions, entry.get("source")),
+            entry,
+        )
 
     async def broadcast_teams(self, data: dict):
-        dead = []
-        for ws in self._teams_connections:
-            try:
-                await ws.send_json(data)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect_teams(ws)
+        session_id = data.get("session_id") or (data.get("data") or {}).get("session_id")
+        self._fanout(
+            self._with_topic(self._teams_connections, self._teams_subscriptions, session_id),
+            data,
+        )
 
     async def broadcast_gm(self, data: dict):
-        dead = []
-        for ws in self._gm_connections:
-            try:
-                await ws.send_json(data)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect_gm(ws)
-
-    async def _ping_client(self, ws: WebSocket) -> bool:
-        """Send a ping and wait for pong. Returns True if client responded."""
-        try:
-            await ws.send_json({"type": "ping"})
-            msg = await asyncio.wait_for(ws.receive_text(), timeout=self.HEARTBEAT_TIMEOUT)
-            data = json.loads(msg)
-            return data.get("type") == "pong"
-        except Exception:
-            return False
-
-    async def _heartbeat_loop(self):
-        """Periodically ping all connected clients, disconnect unresponsive ones."""
-        while True:
-            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
-            if not self._all_connections:
-                continue
-            # Snapshot current connections to avoid mutation during iteration
-            clients = list(self._all_connections)
-            results = await asyncio.gather(
-                *(self._ping_client(ws) for ws in clients),
-                return_exceptions=True,
-            )
-            for ws, alive in zip(clients, results):
-                if alive is not True:
-                    log.info("Heartbeat timeout, disconnecting client")
-                    self._remove_connection(ws)
-                    try:
-                        await ws.close()
-                    except Exception:
-                        pass
-
-    def start_heartbeat(self):
-        """Start the background heartbeat task."""
-        if self._heartbeat_task is None:
-            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
-
-    async def stop_heartbeat(self):
-        """Stop the background heartbeat task."""
-        if self._heartbeat_task is not None:
-            self._heartbeat_task.cancel()
-            try:
-                await self._heartbeat_task
-            except asyncio.CancelledError:
-                pass
-            self._heartbeat_task = None
+        self._fanout(self._gm_connections, data)
 
 
 manager = ConnectionManager()
@@ -186,11 +185,66 @@ team_launcher = TeamLauncher()
 gm_manager = GeneralManager(team_launcher)
 
 
+# ── Log persistence ─────────────────────────────────────────────────────
+
+# Log callbacks queue their rows here and broadcast right away; one task
+# writes the queue to the DB in batches. None tells the task to finish.
+LOG_FLUSH_INTERVAL = 0.05  # seconds a batch may wait to collect more rows
+LOG_FLUSH_MAX = 500        # rows per insert
+_log_queue: asyncio.Queue[tuple[str, str, str, str] | None] = asyncio.Queue()
+
+
+_ts_second = -1
+_ts_prefix = ""
+
+
+def _log_timestamp() -> str:
+    """UTC ISO-8601 timestamp for a log row, like datetime.now(timezone.utc).isoformat().
+
+    The date/time part is formatted once per second rather than building a
+    datetime per line. Unlike isoformat(), microseconds are always included.
+    """
+    global _ts_second, _ts_prefix
+    now = time.time()
+    second = int(now)
+    if second != _ts_second:
+        _ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_second = second
+    return f"{_ts_prefix}.{int((now - second) * 1_000_000):06d}+00:00"
+
+
+def _queue_log(timestamp: str, level: str, message: str, source: str) -> None:
+    _log_queue.put_nowait((timestamp, level, message, source))
+
+
+async def _log_flusher():
+    """Persist queued log rows with one executemany per batch until stopped."""
+    while True:
+        item = await _log_queue.get()
+        if item is None:
+            return
+        rows = [item]
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        stop = False
+        while len(rows) < LOG_FLUSH_MAX and not _log_queue.empty():
+            item = _log_queue.get_nowait()
+            if item is None:
+                stop = True
+                break
+            rows.append(item)
+        try:
+            await db.insert_logs_many(rows)
+        except Exception:
+            log.exception("Failed to persist %d log lines", len(rows))
+        if stop:
+            return
+
+
 # ── Orchestrator log callback ───────────────────────────────────────────
 
 async def on_orchestrator_log(level: str, message: str):
-    ts = datetime.now(timezone.utc).isoformat()
-    await db.insert_log(ts, level, message, source="orchestrator")
+    ts = _log_timestamp()
+    _queue_log(ts, level, message, "orchestrator")
     await manager.broadcast_log({
         "timestamp": ts,
         "level": level,
@@ -198,7 +252,21 @@ async def on_orchestrator_log(level: str, message: str):
         "source": "orchestrator",
     })
 
+async def on_orchestrator_log_batch(lines: list[tuple[str, str]]):
+    ts = _log_timestamp()
+    for level, message in lines:
+        _queue_log(ts, level, message, "orchestrator")
+    await manager.broadcast_log({
+        "type": "log_batch",
+        "source": "orchestrator",
+        "entries": [
+            {"timestamp": ts, "level": level, "message": message, "source": "orchestrator"}
+            for level, message in lines
+        ],
+    })
+
 orchestrator.set_log_callback(on_orchestrator_log)
+orchestrator.set_log_batch_callback(on_orchestrator_log_batch)
 
 
 # ── Team launcher callbacks ────────────────────────────────────────────
@@ -207,8 +275,8 @@ async def on_team_progress(data: dict):
     await manager.broadcast_teams(data)
 
 async def on_team_log(level: str, message: str):
-    ts = datetime.now(timezone.utc).isoformat()
-    await db.insert_log(ts, level, message, source="team-launcher")
+    ts = _log_timestamp()
+    _queue_log(ts, level, message, "team-launcher")
     await manager.broadcast_log({
         "timestamp": ts,
         "level": level,
@@ -226,8 +294,8 @@ async def on_gm_progress(data: dict):
     await manager.broadcast_gm(data)
 
 async def on_gm_log(level: str, message: str):
-    ts = datetime.now(timezone.utc).isoformat()
-    await db.insert_log(ts, level, message, source="gm")
+    ts = _log_timestamp()
+    _queue_log(ts, level, message, "gm")
     await manager.broadcast_log({
         "timestamp": ts,
         "level": level,
@@ -239,14 +307,39 @@ gm_manager.set_progress_callback(on_gm_progress)
 gm_manager.set_log_callback(on_gm_log)
 
 
-# ── New execution callback ──────────────────────────────────────────────
+# ── Watcher callbacks ───────────────────────────────────────────────────
+
+# The watcher only queues the new row ids; one task looks them up and
+# announces them, so file events keep draining while clients are notified.
+_watch_events: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
+
 
 async def on_new_execution(execution_id: int):
+    _watch_events.put_nowait(("execution", execution_id))
+
+
+async def on_new_team_session(session_db_id: int):
+    _watch_events.put_nowait(("team_session", session_db_id))
+
+
+async def _announce_watch_events():
+    while True:
+        kind, row_id = await _watch_events.get()
+        try:
+            if kind == "execution":
+                await _announce_execution(row_id)
+            else:
+                await _announce_team_session(row_id)
+        except Exception:
+            log.exception("Failed to announce new %s #%d", kind, row_id)
+
+
+async def _announce_execution(execution_id: int):
     execution = await db.get_execution(execution_id)
     if execution:
         await manager.broadcast_status({"type": "new_execution", "data": execution})
-        ts = datetime.now(timezone.utc).isoformat()
-        await db.insert_log(ts, "info", f"New execution #{execution_id} ingested", source="watcher")
+        ts = _log_timestamp()
+        _queue_log(ts, "info", f"New execution #{execution_id} ingested", "watcher")
         await manager.broadcast_log({
             "timestamp": ts,
             "level": "info",
@@ -255,14 +348,12 @@ async def on_new_execution(execution_id: int):
         })
 
 
-# ── New team session callback ─────────────────────────────────────────
-
-async def on_new_team_session(session_db_id: int):
+async def _announce_team_session(session_db_id: int):
     session = await db.get_team_session(session_db_id)
     if session:
         await manager.broadcast_teams({"type": "new_team_session", "data": session})
-        ts = datetime.now(timezone.utc).isoformat()
-        await db.insert_log(ts, "info", f"New team session #{session_db_id} ingested", source="watcher")
+        ts = _log_timestamp()
+        _queue_log(ts, "info", f"New team session #{session_db_id} ingested", "watcher")
         await manager.broadcast_log({
             "timestamp": ts,
             "level": "info",
@@ -273,14 +364,44 @@ async def on_new_team_session(session_db_id: int):
 
 # ── Lifespan ────────────────────────────────────────────────────────────
 
+def _install_pidfd_child_watcher() -> None:
+    """Reap subprocesses through pidfds instead of one waiter thread per child.
+
+    Only needed before Python 3.12, which picks the pidfd watcher by itself
+    (and deprecates set_child_watcher). Skipped on kernels without pidfd_open
+    (< 5.3) and under loops with their own reaping, such as uvloop.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    loop = asyncio.get_running_loop()
+    if not isinstance(loop, asyncio.BaseEventLoop):
+        return  # uvloop reaps children on its own
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+        watcher = asyncio.PidfdChildWatcher()
+        watcher.attach_loop(loop)
+        asyncio.set_child_watcher(watcher)
+    except (OSError, AttributeError, NotImplementedError):
+        return
+    log.info("Using pidfd child watcher for subprocesses")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    _install_pidfd_child_watcher()
+    # Python 3.12+: new tasks run inline up to their first suspension, so
+    # short-lived ones finish without a trip through the scheduler
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
     await db.init_db()
     count = await backfill_existing_outputs()
     team_count = await backfill_team_outputs()
     log.info("Database initialized, backfilled %d files + %d team files", count, team_count)
 
+    log_flusher_task = asyncio.create_task(_log_flusher())
+    announcer_task = asyncio.create_task(_announce_watch_events())
+
     # Start file watcher in background
     watcher_task = asyncio.create_task(
         watch_outputs(
@@ -289,29 +410,29 @@ async def lifespan(app: FastAPI):
         )
     )
 
-    # Start WebSocket heartbeat
-    manager.start_heartbeat()
-
-    ts = datetime.now(timezone.utc).isoformat()
-    await db.insert_log(
+    ts = _log_timestamp()
+    _queue_log(
         ts, "info",
         f"Dashboard started, backfilled {count} output files + {team_count} team files",
-        source="dashboard",
+        "dashboard",
     )
 
     yield
 
     # Shutdown
-    await manager.stop_heartbeat()
-    watcher_task.cancel()
-    try:
-        await watcher_task
-    except asyncio.CancelledError:
-        pass
+    for task in (watcher_task, announcer_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
     await gm_manager.cancel_all()
     await team_launcher.cancel_all()
     if orchestrator.running:
         await orchestrator.stop()
+    # Write out everything logged during shutdown before closing the DB
+    _log_queue.put_nowait(None)
+    await log_flusher_task
     await db.close_db()
 
 
@@ -326,32 +447,76 @@ templates = Jinja2Templates(directory=str(config.TEMPLATES_DIR))
 
 # ── Pages ───────────────────────────────────────────────────────────────
 
+# index.html takes no per-request context: render it once per file version
+_index_cache: tuple[int, bytes, str] | None = None  # (mtime_ns, body, etag)
+
+
+def _index_page() -> tuple[bytes, str]:
+    global _index_cache
+    mtime = os.stat(config.TEMPLATES_DIR / "index.html").st_mtime_ns
+    if _index_cache is None or _index_cache[0] != mtime:
+        body = templates.get_template("index.html").render().encode()
+        _index_cache = (mtime, body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+    return _index_cache[1], _index_cache[2]
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    body, etag = _index_page()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
 
 
 # ── REST API ────────────────────────────────────────────────────────────
 
+def _parse_cursor(before: str | None, int_key: bool) -> db.Cursor | None:
+    """Parse a `before=<sort key>:<id>` keyset cursor taken from the last row of a page.
+
+    Raises ValueError on a malformed cursor.
+    """
+    if not before:
+        return None
+    key, _, row_id = before.rpartition(":")
+    if not key:
+        raise ValueError(before)
+    return (int(key) if int_key else key, int(row_id))
+
+
 @app.get("/api/stats")
 async def api_stats():
     return await db.get_stats()
 
 
 @app.get("/api/executions")
-async def api_executions(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0)):
-    executions = await db.get_executions(limit=limit, offset=offset)
-    total = await db.get_execution_count()
-    return {"executions": executions, "total": total, "limit": limit, "offset": offset}
+async def api_executions(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    before: str | None = None,
+):
+    # before=<timestamp_i>:<id> of the previous page's last row
+    try:
+        cursor = _parse_cursor(before, int_key=True)
+    except ValueError:
+        return {"error": "Invalid cursor"}
+    executions, total = await asyncio.gather(
+        db.get_executions_json(limit=limit, offset=offset, before=cursor),
+        db.get_execution_count(),
+    )
+    # Rows are already JSON-encoded by SQLite; splice them in as-is
+    return Response(
+        content=f'{{"executions":{executions},"total":{total},"limit":{limit},"offset":{offset}}}',
+        media_type="application/json",
+    )
 
 
 @app.get("/api/executions/{execution_id}")
 async def api_execution_detail(execution_id: int):
-    execution = await db.get_execution(execution_id)
-    if not execution:
+    detail = await db.get_execution_detail_json(execution_id)
+    if detail is None:
         return {"error": "Not found"}, 404
-    results = await db.get_agent_results(execution_id)
-    return {**execution, "results": results}
+    return Response(content=detail, media_type="application/json")
 
 
 @app.get("/api/agents")
@@ -367,8 +532,7 @@ async def api_costs():
 @app.get("/api/config")
 async def api_config():
     try:
-        with open(config.CONFIG_FILE) as f:
-            return yaml.safe_load(f)
+        return await config.load_orchestra_config_async()
     except FileNotFoundError:
         return {"error": "Config file not found"}
 
@@ -379,29 +543,60 @@ async def api_status():
     return {
         "orchestrator": orchestrator.status(),
         "stats": stats,
-        "outputs_dir": str(config.OUTPUTS_DIR),
-        "db_path": str(config.DB_PATH),
+        "outputs_dir": config.OUTPUTS_DIR_STR,
+        "db_path": config.DB_PATH_STR,
     }
 
 
 @app.get("/api/logs")
-async def api_logs(limit: int = Query(100, ge=1, le=500), level: str | None = None):
-    return await db.get_logs(limit=limit, level=level)
+async def api_logs(
+    limit: int = Query(100, ge=1, le=500),
+    level: str | None = None,
+    before: str | None = None,
+):
+    try:
+        cursor = _parse_cursor(before, int_key=True)
+    except ValueError:
+        return {"error": "Invalid cursor"}
+    return Response(
+        content=await db.get_logs_json(limit=limit, level=level, before=cursor),
+        media_type="application/json",
+    )
 
 
 # ── Teams endpoints ───────────────────────────────────────────────────
 
 @app.get("/api/teams")
-async def api_teams(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0)):
-    sessions = await db.get_team_sessions(limit=limit, offset=offset)
-    total = await db.get_team_session_count()
+async def api_teams(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    before: str | None = None,
+):
+    # before=<started_at>:<id> of the previous page's last row
+    try:
+        cursor = _parse_cursor(before, int_key=False)
+    except ValueError:
+        return {"error": "Invalid cursor"}
+    sessions, total = await asyncio.gather(
+        db.get_team_sessions(limit=limit, offset=offset, before=cursor),
+        db.get_team_session_count(),
+    )
     return {"sessions": sessions, "total": total, "limit": limit, "offset": offset}
 
 
 # Static team paths MUST come before {session_id} to avoid route conflicts
+_team_templates_body: tuple[list, str] | None = None
+
+
 @app.get("/api/teams/templates")
 async def api_team_templates():
-    return get_available_teams()
+    # get_available_teams() hands back the same list until orchestra.yml
+    # changes, so its encoded form is reused as well
+    global _team_templates_body
+    teams = await get_available_teams()
+    if _team_templates_body is None or _team_templates_body[0] is not teams:
+        _team_templates_body = (teams, _encode_frame(teams))
+    return Response(content=_team_templates_body[1], media_type="application/json")
 
 
 @app.post("/api/teams/launch")
@@ -420,10 +615,12 @@ async def api_team_launch(request: Request):
 
 @app.get("/api/teams/{session_id}")
 async def api_team_detail(session_id: int):
-    session = await db.get_team_session(session_id)
+    session, tasks = await asyncio.gather(
+        db.get_team_session(session_id),
+        db.get_team_tasks(session_id),
+    )
     if not session:
         return {"error": "Not found"}, 404
-    tasks = await db.get_team_tasks(session_id)
     return {**session, "tasks": tasks}
 
 
@@ -440,12 +637,27 @@ async def api_team_diff(session_id: str):
     session = await db.get_team_session_by_session_id(session_id)
     if not session:
         return {"error": "Session not found"}
-    repo_path = session.get("repo_path") or str(config.BASE_DIR)
-    result = await worktree.get_worktree_diff(repo_path, session_id)
-    stat = await worktree.get_worktree_stat(repo_path, session_id)
-    if "error" not in stat:
-        result["stat"] = stat.get("stat", "")
-    return result
+    repo_path = session.get("repo_path") or config.BASE_DIR_STR
+    # One git run yields both the --stat summary and the patch
+    result = await worktree.open_worktree_diff(repo_path, session_id, with_stat=True)
+    if "error" in result:
+        return result
+    return StreamingResponse(_diff_json(result), media_type="application/json")
+
+
+async def _diff_json(result: dict):
+    """Encode an open_worktree_diff() result as JSON, escaping the diff as git writes it."""
+    chunks = result.pop("diff")
+    yield '{"diff":"'
+    if chunks is not None:
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        try:
+            async for chunk in chunks:
+                yield json.dumps(decoder.decode(chunk))[1:-1]
+            yield json.dumps(decoder.decode(b"", final=True))[1:-1]
+        finally:
+            await chunks.aclose()
+    yield '",' + _encode_frame(result)[1:]
 
 
 @app.post("/api/teams/{session_id}/merge")
@@ -453,7 +665,7 @@ async def api_team_merge(session_id: str):
     session = await db.get_team_session_by_session_id(session_id)
     if not session:
         return {"error": "Session not found"}
-    repo_path = session.get("repo_path") or str(config.BASE_DIR)
+    repo_path = session.get("repo_path") or config.BASE_DIR_STR
     result = await worktree.merge_worktree(repo_path, session_id)
     if "error" not in result:
         await db.update_team_session_status(
@@ -467,7 +679,7 @@ async def api_team_discard(session_id: str):
     session = await db.get_team_session_by_session_id(session_id)
     if not session:
         return {"error": "Session not found"}
-    repo_path = session.get("repo_path") or str(config.BASE_DIR)
+    repo_path = session.get("repo_path") or config.BASE_DIR_STR
     result = await worktree.delete_worktree(repo_path, session_id)
     if "error" not in result:
         await db.update_team_session_status(
@@ -486,7 +698,7 @@ async def api_team_cancel(session_id: str):
 
 @app.get("/api/gm/templates")
 async def api_gm_templates():
-    return get_available_gm_projects()
+    return await get_available_gm_projects()
 
 
 @app.post("/api/gm/launch")
@@ -512,25 +724,42 @@ async def api_gm_launch(request: Request):
 
 
 @app.get("/api/gm/projects")
-async def api_gm_projects(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0)):
-    projects = await db.get_gm_projects(limit=limit, offset=offset)
-    total = await db.get_gm_project_count()
+async def api_gm_projects(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    before: str | None = None,
+):
+    # before=<started_at>:<id> of the previous page's last row
+    try:
+        cursor = _parse_cursor(before, int_key=False)
+    except ValueError:
+        return {"error": "Invalid cursor"}
+    projects, total = await asyncio.gather(
+        db.get_gm_projects(limit=limit, offset=offset, before=cursor),
+        db.get_gm_project_count(),
+    )
     return {"projects": projects, "total": total, "limit": limit, "offset": offset}
 
 
 @app.get("/api/gm/projects/{project_id}")
 async def api_gm_project_detail(project_id: str):
-    project = await db.get_gm_project(project_id)
+    project, sessions, decisions = await asyncio.gather(
+        db.get_gm_project(project_id),
+        db.get_gm_agent_sessions(project_id),
+        db.get_gm_decisions_for_project(project_id),
+    )
     if not project:
         return {"error": "Not found"}
-    sessions = await db.get_gm_agent_sessions(project_id)
     # Enrich with timing from team_sessions
+    team_sessions = {
+        ts["session_id"]: ts
+        for ts in await db.get_team_sessions_by_ids(s["session_id"] for s in sessions)
+    }
     for s in sessions:
-        ts = await db.get_team_session_by_session_id(s["session_id"])
+        ts = team_sessions.get(s["session_id"])
         if ts:
             s["started_at"] = ts.get("started_at")
             s["completed_at"] = ts.get("completed_at")
-    decisions = await db.get_gm_decisions_for_project(project_id)
     return {**project, "sessions": sessions, "decisions": decisions}
 
 
@@ -579,35 +808,50 @@ async def api_stop():
 
 # ── WebSocket endpoints ────────────────────────────────────────────────
 
+def _parse_topics(value: str | None) -> frozenset[str]:
+    """Split a comma-separated ?sources= / ?session_id= filter."""
+    if not value:
+        return frozenset()
+    return frozenset(t for t in (t.strip() for t in value.split(",")) if t)
+
+
 @app.websocket("/ws/status")
 async def ws_status(ws: WebSocket):
     await manager.connect_status(ws)
     try:
         while True:
-            # Keep connection alive, listen for pings
+            # Keep the connection open until the client goes away
             await ws.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect_status(ws)
+        pass
+    finally:
+        manager.disconnect(ws)
 
 
 @app.websocket("/ws/logs")
-async def ws_logs(ws: WebSocket):
-    await manager.connect_logs(ws)
+async def ws_logs(ws: WebSocket, sources: str | None = None):
+    # ?sources=orchestrator,gm limits the stream to those log sources
+    await manager.connect_logs(ws, _parse_topics(sources))
     try:
         while True:
             await ws.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect_logs(ws)
+        pass
+    finally:
+        manager.disconnect(ws)
 
 
 @app.websocket("/ws/teams")
-async def ws_teams(ws: WebSocket):
-    await manager.connect_teams(ws)
+async def ws_teams(ws: WebSocket, session_id: str | None = None):
+    # ?session_id=a,b limits the stream to events for those sessions
+    await manager.connect_teams(ws, _parse_topics(session_id))
     try:
         while True:
             await ws.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect_teams(ws)
+        pass
+    finally:
+        manager.disconnect(ws)
 
 
 @app.websocket("/ws/gm")
@@ -617,11 +861,19 @@ async def ws_gm(ws: WebSocket):
         while True:
             await ws.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect_gm(ws)
+        pass
+    finally:
+        manager.disconnect(ws)
 
 
 # ── Entry point ─────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host=config.HOST, port=config.PORT)
+    # "auto" runs on uvloop and httptools (both in uvicorn[standard]) when
+    # they're installed. WebSocket liveness uses protocol-level PING frames:
+    # browsers answer them on their own, unresponsive sockets get closed.
+    uvicorn.run(
+        app, host=config.HOST, port=config.PORT, loop="auto", http="auto", ws="websockets",
+        ws_ping_interval=config.WS_PING_INTERVAL, ws_ping_timeout=config.WS_PING_TIMEOUT,
+    )
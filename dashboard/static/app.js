@@ -7,6 +7,9 @@
     let wsStatus = null;
     let wsLogs = null;
     let historyOffset = 0;
+    // Keyset cursors ("timestamp_i:id" of each previous page's last row)
+    const historyCursors = [];
+    let historyNextCursor = null;
     const PAGE_SIZE = 20;
 
     // Track current running session for progress terminal
@@ -179,15 +182,20 @@
     // ── History Panel ───────────────────────────────────────────────────
 
     async function loadHistory() {
-        const data = await api(`/api/executions?limit=${PAGE_SIZE}&offset=${historyOffset}`);
+        const cursor = historyCursors[historyCursors.length - 1];
+        const query = cursor ? `&before=${encodeURIComponent(cursor)}` : "";
+        const data = await api(`/api/executions?limit=${PAGE_SIZE}${query}`);
         const execs = data.executions || [];
         const total = data.total || 0;
-        const page = Math.floor(historyOffset / PAGE_SIZE) + 1;
+        historyOffset = historyCursors.length * PAGE_SIZE;
+        const last = execs[execs.length - 1];
+        historyNextCursor = last ? `${last.timestamp_i}:${last.id}` : null;
+        const page = historyCursors.length + 1;
         const totalPages = Math.ceil(total / PAGE_SIZE);
 
         $("#history-info").textContent = `Page ${page} of ${totalPages} (${total} total)`;
         $("#history-prev").disabled = historyOffset === 0;
-        $("#history-next").disabled = historyOffset + PAGE_SIZE >= total;
+        $("#history-next").disabled = !historyNextCursor || historyOffset + PAGE_SIZE >= total;
 
         if (execs.length === 0) {
             $("#history-table").innerHTML = '<p class="muted">No executions</p>';
@@ -219,12 +227,13 @@
     }
 
     $("#history-prev").addEventListener("click", () => {
-        historyOffset = Math.max(0, historyOffset - PAGE_SIZE);
+        historyCursors.pop();
         loadHistory();
     });
 
     $("#history-next").addEventListener("click", () => {
-        historyOffset += PAGE_SIZE;
+        if (!historyNextCursor) return;
+        historyCursors.push(historyNextCursor);
         loadHistory();
     });
 
@@ -1439,10 +1448,6 @@
         wsStatus.onmessage = (e) => {
             try {
                 const data = JSON.parse(e.data);
-                if (data.type === "ping") {
-                    wsStatus.send(JSON.stringify({ type: "pong" }));
-                    return;
-                }
                 if (data.type === "new_execution") {
                     // Refresh overview if visible
                     const activePanel = document.querySelector(".panel.active");
@@ -1458,11 +1463,11 @@
         wsLogs.onmessage = (e) => {
             try {
                 const data = JSON.parse(e.data);
-                if (data.type === "ping") {
-                    wsLogs.send(JSON.stringify({ type: "pong" }));
-                    return;
+                if (data.type === "log_batch") {
+                    data.entries.forEach(appendLogEntry);
+                } else {
+                    appendLogEntry(data);
                 }
-                appendLogEntry(data);
             } catch {}
         };
 
@@ -1471,10 +1476,6 @@
         wsTeams.onmessage = (e) => {
             try {
                 const data = JSON.parse(e.data);
-                if (data.type === "ping") {
-                    wsTeams.send(JSON.stringify({ type: "pong" }));
-                    return;
-                }
                 if (data.type === "team_progress") {
                     handleTeamProgress(data);
                     captureGMAgentOutput(data);
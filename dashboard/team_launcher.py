@@ -6,14 +6,19 @@ import asyncio
 import json
 import logging
 import os
+import re
+import secrets
 import shutil
 import signal
-import uuid
+import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Awaitable
+from typing import IO, Any, Callable, Awaitable, Iterable
 
-import yaml
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
 
 from . import config, db
 from .worktree import create_worktree, _run_git
@@ -28,17 +33,38 @@ CRITICAL_ERROR_PATTERNS = [
     "OSError: [Errno 28]",
 ]
 CRITICAL_ERROR_THRESHOLD = 2  # Kill after this many occurrences
+# Matched against the raw stderr bytes; one scan rules out the common case
+# of a line matching no pattern
+_CRITICAL_ERROR_BYTES = [(p, p.encode()) for p in CRITICAL_ERROR_PATTERNS]
+_CRITICAL_ERROR_RE = re.compile(b"|".join(re.escape(b) for _, b in _CRITICAL_ERROR_BYTES))
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+STREAM_READ_CHUNK = 65536  # bytes per read from a session's stdout/stderr
+FINISHED_MAX = 1024  # unconsumed terminal statuses kept for wait_any_terminal
 
 
-def get_available_teams() -> list[dict]:
-    """Read team definitions from orchestra.yml for the UI dropdown."""
+# (parsed config it was built from, team list)
+_teams_cache: tuple[Any, list[dict]] | None = None
+
+
+async def get_available_teams() -> list[dict]:
+    """Read team definitions from orchestra.yml for the UI dropdown.
+
+    The list is rebuilt only when the config file changes; the same list
+    object is returned until then, so treat it as read-only.
+    """
+    global _teams_cache
     try:
-        with open(config.CONFIG_FILE) as f:
-            cfg = yaml.safe_load(f)
+        cfg = await config.load_orchestra_config_async()
     except FileNotFoundError:
         log.warning("Config file not found: %s", config.CONFIG_FILE)
         return []
+    if _teams_cache is not None and _teams_cache[0] is cfg:
+        return _teams_cache[1]
+    _teams_cache = (cfg, _build_team_list(cfg))
+    return _teams_cache[1]
 
+
+def _build_team_list(cfg: Any) -> list[dict]:
     teams_cfg = cfg.get("teams", {})
     if not teams_cfg.get("enabled"):
         return []
@@ -56,6 +82,33 @@ def get_available_teams() -> list[dict]:
     return result
 
 
+# Stands in for the "output" value until _write_result_file copies it in
+_OUTPUT_PLACEHOLDER = "\0output\0"
+
+
+def _json_bytes(obj) -> bytes:
+    """Compact UTF-8 JSON, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _write_result_file(path: Path, data: dict, output: IO[str]) -> None:
+    """Write data as compact JSON, filling its "output" from the output file.
+
+    The output text is escaped and copied across in chunks, so it never has
+    to be held in memory as one string.
+    """
+    head, tail = _json_bytes(data).split(_json_bytes(_OUTPUT_PLACEHOLDER), 1)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    output.seek(0)
+    with open(path, "wb") as f:
+        f.write(head + b'"')
+        while chunk := output.read(STREAM_READ_CHUNK):
+            f.write(_json_bytes(chunk)[1:-1])
+        f.write(b'"' + tail)
+
+
 ProgressCallback = Callable[[dict], Awaitable[None]]
 
 
@@ -64,6 +117,9 @@ class TeamLauncher:
 
     def __init__(self):
         self._processes: dict[str, asyncio.subprocess.Process] = {}
+        self._finished: dict[str, str] = {}  # session_id → terminal status
+        self._finished_cond = asyncio.Condition()
+        self._cleanup_tasks: set[asyncio.Task] = set()
         self._progress_callback: ProgressCallback | None = None
         self._log_callback: Callable | None = None
 
@@ -85,6 +141,50 @@ class TeamLauncher:
     def active_sessions(self) -> list[str]:
         return [sid for sid, proc in self._processes.items() if proc.returncode is None]
 
+    async def _mark_finished(self, session_id: str, status: str) -> None:
+        """Record a terminal status (already written to the DB) and wake waiters.
+
+        Nobody consumes the entries of sessions launched outside the GM, so
+        the oldest are dropped past FINISHED_MAX; a waiter that misses one
+        falls back to its timeout and the DB check.
+        """
+        async with self._finished_cond:
+            self._finished[session_id] = status
+            while len(self._finished) > FINISHED_MAX:
+                del self._finished[next(iter(self._finished))]
+            self._finished_cond.notify_all()
+
+    async def wait_any_terminal(
+        self, session_ids: Iterable[str], timeout: float | None = None,
+    ) -> set[str]:
+        """Block until at least one of session_ids has finished; return those that have.
+
+        The returned sessions are consumed: their entries are dropped, so a
+        caller must act on them (their status is already in the DB).
+
+        Sessions this launcher never started (e.g. before a restart) can't
+        notify, so when any are present the wait gives up after timeout and
+        returns what it has — the caller re-checks the DB either way.
+        """
+        ids = set(session_ids)
+
+        def finished() -> set[str]:
+            return ids & self._finished.keys()
+
+        untracked = any(sid not in self._processes and sid not in self._finished for sid in ids)
+        async with self._finished_cond:
+            try:
+                await asyncio.wait_for(
+                    self._finished_cond.wait_for(finished),
+                    timeout if untracked else None,
+                )
+            except asyncio.TimeoutError:
+                pass
+            done = finished()
+            for sid in done:
+                del self._finished[sid]
+            return done
+
     async def launch(
         self,
         team_name: str,
@@ -92,8 +192,10 @@ class TeamLauncher:
         repo_path: str | None = None,
     ) -> dict:
         """Launch a new team session in an isolated worktree."""
-        session_id = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
-        effective_repo = repo_path or str(config.BASE_DIR)
+        now = datetime.now(timezone.utc)
+        session_id = now.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+        ts = now.isoformat()
+        effective_repo = repo_path or config.BASE_DIR_STR
 
         # Create worktree
         wt_result = await create_worktree(effective_repo, session_id)
@@ -104,7 +206,6 @@ class TeamLauncher:
         worktree_path = wt_result["worktree_path"]
 
         # Insert DB record
-        ts = datetime.now(timezone.utc).isoformat()
         db_id = await db.insert_team_session(
             session_id=session_id,
             team_name=team_name,
@@ -149,6 +250,7 @@ class TeamLauncher:
             )
         except OSError as e:
             await db.update_team_session_status(session_id, "failed", datetime.now(timezone.utc).isoformat())
+            await self._mark_finished(session_id, "failed")
             return {"error": f"Failed to start claude: {e}"}
 
         self._processes[session_id] = proc
@@ -180,49 +282,78 @@ class TeamLauncher:
         db_id: int,
     ) -> None:
         """Read stdout/stderr, broadcast progress, finalize on exit."""
-        collected_stdout: list[str] = []
+        # stdout is spooled to an anonymous temp file (newline-separated, as
+        # it ends up in the result JSON) instead of accumulating in memory
+        stdout_spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+        stdout_lines = 0
         error_counts: dict[str, int] = {}
         kill_triggered = False
 
         async def _read_stream(stream, stream_name: str):
-            nonlocal kill_triggered
-            while True:
-                line = await stream.readline()
+            # Only "data" changes from one line to the next
+            envelope = {
+                "type": "team_progress",
+                "session_id": session_id,
+                "event": stream_name,
+                "db_id": db_id,
+            }
+
+            async def _handle_line(line: bytes | bytearray) -> bool:
+                """Process one output line; False once the session was killed."""
+                nonlocal kill_triggered, stdout_lines
+                # Blank lines and the pattern check never need decoding
+                line = line.rstrip()
                 if not line:
-                    break
+                    return True
                 text = line.decode("utf-8", errors="replace").rstrip()
-                if text:
-                    if stream_name == "stdout":
-                        collected_stdout.append(text)
-
-                    # Check stderr for critical resource errors
-                    if stream_name == "stderr":
-                        for pattern in CRITICAL_ERROR_PATTERNS:
-                            if pattern in text:
-                                error_counts[pattern] = error_counts.get(pattern, 0) + 1
-                                if error_counts[pattern] >= CRITICAL_ERROR_THRESHOLD:
-                                    kill_triggered = True
-                                    log.error(
-                                        "Session %s hit critical error %dx: %s",
-                                        session_id, error_counts[pattern], pattern,
-                                    )
-                                    await self._emit_progress({
-                                        "type": "team_progress",
-                                        "session_id": session_id,
-                                        "event": "resource_error",
-                                        "data": f"Auto-killed: '{pattern}' occurred {error_counts[pattern]} times",
-                                        "db_id": db_id,
-                                    })
-                                    proc.kill()
-                                    return
-
-                    await self._emit_progress({
-                        "type": "team_progress",
-                        "session_id": session_id,
-                        "event": stream_name,
-                        "data": text,
-                        "db_id": db_id,
-                    })
+                if not text:
+                    return True
+                if stream_name == "stdout":
+                    stdout_spool.write(f"\n{text}" if stdout_lines else text)
+                    stdout_lines += 1
+
+                # Check stderr for critical resource errors
+                if stream_name == "stderr" and _CRITICAL_ERROR_RE.search(line):
+                    for pattern, pattern_b in _CRITICAL_ERROR_BYTES:
+                        if pattern_b in line:
+                            error_counts[pattern] = error_counts.get(pattern, 0) + 1
+                            if error_counts[pattern] >= CRITICAL_ERROR_THRESHOLD:
+                                kill_triggered = True
+                                log.error(
+                                    "Session %s hit critical error %dx: %s",
+                                    session_id, error_counts[pattern], pattern,
+                                )
+                                await self._emit_progress({
+                                    "type": "team_progress",
+                                    "session_id": session_id,
+                                    "event": "resource_error",
+                                    "data": f"Auto-killed: '{pattern}' occurred {error_counts[pattern]} times",
+                                    "db_id": db_id,
+                                })
+                                proc.kill()
+                                return False
+
+                await self._emit_progress({**envelope, "data": text})
+                return True
+
+            # Read in large chunks and split lines here rather than paying an
+            # await per line; a trailing partial line waits for the next chunk
+            buf = bytearray()
+            while True:
+                chunk = await stream.read(STREAM_READ_CHUNK)
+                if not chunk:
+                    break
+                buf += chunk
+                end = buf.rfind(b"\n")
+                if end < 0:
+                    continue
+                lines = buf[:end].split(b"\n")
+                del buf[:end + 1]
+                for line in lines:
+                    if not await _handle_line(line):
+                        return
+            if buf:
+                await _handle_line(buf)
 
         await asyncio.gather(
             _read_stream(proc.stdout, "stdout"),
@@ -251,35 +382,36 @@ class TeamLauncher:
                 else:
                     log.warning("Auto-commit failed for session %s: %s", session_id, cerr)
 
-            # Clean worktree-local target/ to reclaim disk space
+            # Clean worktree-local target/ to reclaim disk space. A Rust
+            # target/ can hold tens of thousands of files, so the session
+            # finishes without waiting for the delete.
             wt_target = Path(wt_path) / "target"
             if wt_target.is_dir():
-                try:
-                    shutil.rmtree(wt_target)
-                    log.info("Cleaned worktree target/ for session %s", session_id)
-                except OSError as e:
-                    log.warning("Failed to clean worktree target/ for session %s: %s", session_id, e)
+                task = asyncio.create_task(self._clean_target(session_id, wt_target))
+                self._cleanup_tasks.add(task)
+                task.add_done_callback(self._cleanup_tasks.discard)
 
         await db.update_team_session_status(session_id, status, completed_at)
+        await self._mark_finished(session_id, status)
 
         # Write result to outputs/
         output_filename = f"teams-{session_id}.json"
         output_path = config.OUTPUTS_DIR / output_filename
         try:
-            config.OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
             result_data = {
                 "session_id": session_id,
                 "team_name": team_name,
                 "status": status,
                 "exit_code": exit_code,
-                "output": "\n".join(collected_stdout),
+                "output": _OUTPUT_PLACEHOLDER,
                 "completed_at": completed_at,
             }
-            with open(output_path, "w") as f:
-                json.dump(result_data, f, indent=2)
+            await asyncio.to_thread(_write_result_file, output_path, result_data, stdout_spool)
             await db.update_team_session_filename(session_id, output_filename)
         except OSError as e:
             log.error("Failed to write output file: %s", e)
+        finally:
+            stdout_spool.close()
 
         # Clean up process reference
         self._processes.pop(session_id, None)
@@ -298,6 +430,14 @@ class TeamLauncher:
             f"Team '{team_name}' session {session_id} {status} (exit={exit_code})",
         )
 
+    async def _clean_target(self, session_id: str, wt_target: Path) -> None:
+        """Delete a worktree's target/ in a thread."""
+        try:
+            await asyncio.to_thread(shutil.rmtree, wt_target)
+            log.info("Cleaned worktree target/ for session %s", session_id)
+        except OSError as e:
+            log.warning("Failed to clean worktree target/ for session %s: %s", session_id, e)
+
     async def cancel(self, session_id: str, timeout: float = 10.0) -> dict:
         """Cancel a running team session."""
         proc = self._processes.get(session_id)
@@ -316,6 +456,7 @@ class TeamLauncher:
 
         completed_at = datetime.now(timezone.utc).isoformat()
         await db.update_team_session_status(session_id, "cancelled", completed_at)
+        await self._mark_finished(session_id, "cancelled")
         self._processes.pop(session_id, None)
 
         await self._emit_progress({
@@ -10,10 +10,17 @@ from pathlib import Path
 
 from watchfiles import awatch, Change
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib parser
+    orjson = None
+
 from . import config, db
 
 log = logging.getLogger("dashboard.watcher")
 
+BACKFILL_BATCH = 1000  # files committed per transaction during backfill
+
 
 def estimate_cost(text: str | None, client_mode: str | None) -> float:
     """Estimate API cost for a single agent result.
@@ -30,121 +37,186 @@ def estimate_cost(text: str | None, client_mode: str | None) -> float:
     return round(cost, 6)
 
 
-async def ingest_result_file(filepath: Path) -> int | None:
-    """Parse a results-*.json file and insert into DB. Returns execution id or None."""
-    filename = filepath.name
+def _load_json(filepath: Path):
+    """Parse a JSON file, straight from bytes with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(filepath.read_bytes())
+    return json.loads(filepath.read_bytes())
 
-    if await db.execution_exists(filename):
-        return None
 
+def _parse_result_file(filepath: Path) -> tuple[tuple, list[tuple]] | None:
+    """Read a results-*.json file into (execution, results) insert rows, or None."""
+    filename = filepath.name
     try:
-        raw = filepath.read_text()
-        data = json.loads(raw)
-    except (json.JSONDecodeError, OSError) as e:
+        data = _load_json(filepath)
+    except (ValueError, OSError) as e:
         log.warning("Failed to parse %s: %s", filename, e)
         return None
 
     results = data.get("results", [])
-    success_count = sum(1 for r in results if r.get("status") == "success")
-    fail_count = sum(1 for r in results if r.get("status") == "failed")
-
+    # One pass builds the rows and the execution's totals
+    success_count = fail_count = 0
     total_cost = 0.0
+    rows = []
+    append = rows.append
     for r in results:
-        total_cost += estimate_cost(r.get("output"), r.get("client_mode"))
-
-    execution_id = await db.insert_execution(
-        timestamp=data.get("timestamp", datetime.now(timezone.utc).isoformat()),
-        mode=data.get("mode", "unknown"),
-        global_client_mode=data.get("global_client_mode"),
-        filename=filename,
-        agent_count=len(results),
-        success_count=success_count,
-        fail_count=fail_count,
-        estimated_cost=total_cost,
+        status = r.get("status", "unknown")
+        if status == "success":
+            success_count += 1
+        elif status == "failed":
+            fail_count += 1
+        output = r.get("output")
+        client_mode = r.get("client_mode")
+        cost = estimate_cost(output, client_mode)
+        total_cost += cost
+        append((
+            r.get("agent", "unknown"),
+            status,
+            output,
+            r.get("error"),
+            client_mode,
+            r.get("timestamp"),
+            cost,
+        ))
+
+    # insert_execution() argument order
+    execution = (
+        data.get("timestamp", datetime.now(timezone.utc).isoformat()),
+        data.get("mode", "unknown"),
+        data.get("global_client_mode"),
+        filename,
+        len(results),
+        success_count,
+        fail_count,
+        total_cost,
     )
+    return execution, rows
 
-    for r in results:
-        agent_cost = estimate_cost(r.get("output"), r.get("client_mode"))
-        await db.insert_agent_result(
-            execution_id=execution_id,
-            agent=r.get("agent", "unknown"),
-            status=r.get("status", "unknown"),
-            output=r.get("output"),
-            error=r.get("error"),
-            client_mode=r.get("client_mode"),
-            timestamp=r.get("timestamp"),
-            estimated_cost=agent_cost,
-        )
 
-    log.info("Ingested %s -> execution #%d (%d agents)", filename, execution_id, len(results))
+async def ingest_result_file(filepath: Path) -> int | None:
+    """Parse a results-*.json file and insert into DB. Returns execution id or None."""
+    filename = filepath.name
+
+    if await db.execution_exists(filename):
+        return None
+
+    parsed = await asyncio.to_thread(_parse_result_file, filepath)
+    if parsed is None:
+        return None
+    execution, rows = parsed
+
+    # The set check above skips parsing known files; the conditional insert
+    # closes the race with a concurrent ingest of the same file. The
+    # execution and its results commit together.
+    execution_id = await db.insert_execution_with_results(*execution, results=rows)
+    if execution_id is None:
+        return None
+
+    log.info("Ingested %s -> execution #%d (%d agents)", filename, execution_id, len(rows))
     return execution_id
 
 
 async def backfill_existing_outputs() -> int:
-    """Scan outputs/ directory and ingest any files not yet in the DB."""
+    """Scan outputs/ directory and ingest any files not yet in the DB.
+
+    New files are committed BACKFILL_BATCH at a time rather than one
+    transaction each.
+    """
     outputs_dir = config.OUTPUTS_DIR
     if not outputs_dir.is_dir():
         log.warning("Outputs directory does not exist: %s", outputs_dir)
         return 0
 
     count = 0
+    batch: list[tuple[tuple, list[tuple]]] = []
+
+    async def flush():
+        nonlocal count
+        ids = await db.insert_executions_with_results_many(batch)
+        count += sum(1 for i in ids if i is not None)
+        batch.clear()
+
     for fp in sorted(outputs_dir.glob("results-*.json")):
-        result = await ingest_result_file(fp)
-        if result is not None:
-            count += 1
+        if await db.execution_exists(fp.name):
+            continue
+        parsed = await asyncio.to_thread(_parse_result_file, fp)
+        if parsed is not None:
+            batch.append(parsed)
+            if len(batch) >= BACKFILL_BATCH:
+                await flush()
+    await flush()
 
     if count:
         log.info("Backfilled %d existing output files", count)
     return count
 
 
-async def ingest_team_result_file(filepath: Path) -> int | None:
-    """Parse a teams-*.json file and insert into DB. Returns session db id or None."""
+def _parse_team_result_file(filepath: Path) -> tuple[tuple, list[tuple]] | None:
+    """Read a teams-*.json file into (session, tasks) insert rows, or None."""
     filename = filepath.name
 
     # Derive a session_id from filename
     session_id = filename.replace(".json", "")
 
-    if await db.team_session_exists(session_id):
-        return None
-
     try:
-        raw = filepath.read_text()
-        data = json.loads(raw)
-    except (json.JSONDecodeError, OSError) as e:
+        data = _load_json(filepath)
+    except (ValueError, OSError) as e:
         log.warning("Failed to parse team file %s: %s", filename, e)
         return None
 
     results = data.get("results", [])
-    success_count = sum(1 for r in results if r.get("status") == "success")
-    fail_count = sum(1 for r in results if r.get("status") == "failed")
-
-    db_id = await db.insert_team_session(
-        session_id=session_id,
-        team_name=data.get("mode", "unknown"),
-        task_description=None,
-        status="completed" if fail_count == 0 else "partial",
-        started_at=data.get("timestamp", datetime.now(timezone.utc).isoformat()),
-        completed_at=datetime.now(timezone.utc).isoformat(),
-        filename=filename,
-        teammate_count=len(results),
-        success_count=success_count,
-        fail_count=fail_count,
+    success_count = fail_count = 0
+    tasks = []
+    for r in results:
+        status = r.get("status", "unknown")
+        if status == "success":
+            success_count += 1
+        elif status == "failed":
+            fail_count += 1
+        tasks.append((
+            r.get("agent", "unknown"),
+            None,
+            status,
+            r.get("output"),
+            r.get("error"),
+            r.get("timestamp"),
+            r.get("timestamp"),
+        ))
+
+    now = datetime.now(timezone.utc).isoformat()
+    # insert_team_session() argument order
+    session = (
+        session_id,
+        data.get("mode", "unknown"),
+        None,
+        "completed" if fail_count == 0 else "partial",
+        data.get("timestamp", now),
+        now,
+        filename,
+        len(results),
+        success_count,
+        fail_count,
     )
+    return session, tasks
 
-    for r in results:
-        await db.insert_team_task(
-            session_id=db_id,
-            teammate=r.get("agent", "unknown"),
-            role=None,
-            status=r.get("status", "unknown"),
-            output=r.get("output"),
-            error=r.get("error"),
-            started_at=r.get("timestamp"),
-            completed_at=r.get("timestamp"),
-        )
 
-    log.info("Ingested team file %s -> session #%d (%d teammates)", filename, db_id, len(results))
+async def ingest_team_result_file(filepath: Path) -> int | None:
+    """Parse a teams-*.json file and insert into DB. Returns session db id or None."""
+    filename = filepath.name
+
+    if await db.team_session_exists(filename.replace(".json", "")):
+        return None
+
+    parsed = await asyncio.to_thread(_parse_team_result_file, filepath)
+    if parsed is None:
+        return None
+    session, tasks = parsed
+
+    db_id = await db.insert_team_session_with_tasks(*session, tasks=tasks)
+    if db_id is None:
+        return None
+
+    log.info("Ingested team file %s -> session #%d (%d teammates)", filename, db_id, len(tasks))
     return db_id
 
 
@@ -155,10 +227,23 @@ async def backfill_team_outputs() -> int:
         return 0
 
     count = 0
+    batch: list[tuple[tuple, list[tuple]]] = []
+
+    async def flush():
+        nonlocal count
+        ids = await db.insert_team_sessions_with_tasks_many(batch)
+        count += sum(1 for i in ids if i is not None)
+        batch.clear()
+
     for fp in sorted(outputs_dir.glob("teams-*.json")):
-        result = await ingest_team_result_file(fp)
-        if result is not None:
-            count += 1
+        if await db.team_session_exists(fp.name.replace(".json", "")):
+            continue
+        parsed = await asyncio.to_thread(_parse_team_result_file, fp)
+        if parsed is not None:
+            batch.append(parsed)
+            if len(batch) >= BACKFILL_BATCH:
+                await flush()
+    await flush()
 
     if count:
         log.info("Backfilled %d existing team output files", count)
@@ -178,19 +263,29 @@ async def watch_outputs(on_new_execution=None, on_new_team_session=None) -> None
     log.info("Watching %s for new result files...", outputs_dir)
 
     async for changes in awatch(str(outputs_dir)):
-        for change_type, path_str in changes:
-            path = Path(path_str)
-            if change_type not in (Change.added, Change.modified) or path.suffix != ".json":
-                continue
-
-            # Small delay to let file finish writing
-            await asyncio.sleep(0.5)
-
-            if path.name.startswith("results-"):
-                exec_id = await ingest_result_file(path)
-                if exec_id is not None and on_new_execution:
+        paths = {
+            Path(path_str) for change_type, path_str in changes
+            if change_type in (Change.added, Change.modified) and path_str.endswith(".json")
+        }
+        result_paths = sorted(p for p in paths if p.name.startswith("results-"))
+        team_paths = sorted(p for p in paths if p.name.startswith("teams-"))
+        if not result_paths and not team_paths:
+            continue
+
+        # One small delay per batch to let the files finish writing
+        await asyncio.sleep(0.5)
+
+        # Files are read and parsed in threads, so the batch overlaps
+        ids = await asyncio.gather(
+            *(ingest_result_file(p) for p in result_paths),
+            *(ingest_team_result_file(p) for p in team_paths),
+        )
+        exec_ids, session_ids = ids[:len(result_paths)], ids[len(result_paths):]
+        if on_new_execution:
+            for exec_id in exec_ids:
+                if exec_id is not None:
                     await on_new_execution(exec_id)
-            elif path.name.startswith("teams-"):
-                session_id = await ingest_team_result_file(path)
-                if session_id is not None and on_new_team_session:
+        if on_new_team_session:
+            for session_id in session_ids:
+                if session_id is not None:
                     await on_new_team_session(session_id)
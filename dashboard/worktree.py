@@ -4,61 +4,219 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from pathlib import Path
+import os
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Callable
+
+try:
+    import pygit2
+except ImportError:  # optional: read-only lookups fall back to the git CLI
+    pygit2 = None
+
+from . import config
 
 log = logging.getLogger("dashboard.worktree")
 
 WORKTREE_DIR = ".worktrees"
 BRANCH_PREFIX = "team"
+MERGE_CACHE_SIZE = 128
+STREAM_READ_CHUNK = 65536  # bytes per read when streaming git output
+_BRANCH_PREFIX_SLASH = f"{BRANCH_PREFIX}/"
+
+# Caps concurrent _run_git() processes. Streamed commands (_stream_git) don't
+# take a slot: their caller may still need _run_git() while the stream is open.
+_git_slots = asyncio.Semaphore(config.GIT_CONCURRENCY)
+
+# (repo_path, "HEAD oid\nbranch oid") → merge-tree run; see detect_conflicts()
+_merge_cache: OrderedDict[tuple[str, str], asyncio.Future] = OrderedDict()
+
+# repo_path → (open pygit2 repository, lock); libgit2 handles aren't safe to
+# use from two threads at once
+_repos: dict[str, tuple["pygit2.Repository", threading.Lock]] = {}
+# (repo_path, branch) → merge-base lookup in flight; see _merge_base()
+_merge_base_inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+
+_ASCII_SPACE = b" \t\n\r\x0b\x0c"
+
+
+def _decode_output(out: bytes) -> str:
+    """UTF-8 decode git output minus surrounding whitespace, copying it once.
+
+    Only ASCII whitespace is trimmed; the slice is decoded straight from a
+    memoryview rather than via a stripped copy of the bytes.
+    """
+    start, end = 0, len(out)
+    while end > start and out[end - 1] in _ASCII_SPACE:
+        end -= 1
+    while start < end and out[start] in _ASCII_SPACE:
+        start += 1
+    return str(memoryview(out)[start:end], "utf-8", "replace")
 
 
 async def _run_git(*args: str, cwd: str) -> tuple[int, str, str]:
     """Run a git command and return (returncode, stdout, stderr)."""
-    proc = await asyncio.create_subprocess_exec(
-        "git", *args,
-        cwd=cwd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, stderr = await proc.communicate()
+    async with _git_slots:
+        proc = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
     return (
         proc.returncode,
-        stdout.decode("utf-8", errors="replace").strip(),
+        _decode_output(stdout),
         stderr.decode("utf-8", errors="replace").strip(),
     )
 
 
-async def create_worktree(repo_path: str, session_id: str) -> dict:
-    """Create a new branch + worktree for a team session.
+async def _stream_git(*args: str, cwd: str) -> tuple[int, AsyncIterator[bytes] | None, str]:
+    """Run a git command with stdout streamed rather than buffered.
 
-    Returns dict with branch_name, worktree_path, or error.
+    Waits for the first output: returns (0, chunks, "") once there is some,
+    or (returncode, None, stderr) if the command printed nothing. Chunks
+    leave out surrounding whitespace like _run_git(); closing the iterator
+    before the end kills the process.
     """
-    branch = f"{BRANCH_PREFIX}/{session_id}"
-    wt_dir = str(Path(repo_path) / WORKTREE_DIR / session_id)
-
-    # Get current branch to use as base
-    rc, base_branch, err = await _run_git("rev-parse", "--abbrev-ref", "HEAD", cwd=repo_path)
-    if rc != 0:
-        return {"error": f"Failed to get current branch: {err}"}
-
-    # Create the branch from current HEAD
-    rc, out, err = await _run_git("branch", branch, "HEAD", cwd=repo_path)
-    if rc != 0:
-        return {"error": f"Failed to create branch: {err}"}
+    proc = await asyncio.create_subprocess_exec(
+        "git", *args,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr = asyncio.ensure_future(proc.stderr.read())
+
+    async def read():
+        try:
+            pending = b""  # trailing whitespace, held back until more output follows
+            leading = True
+            while chunk := await proc.stdout.read(STREAM_READ_CHUNK):
+                if leading:
+                    chunk = chunk.lstrip(_ASCII_SPACE)
+                    leading = not chunk
+                body = chunk.rstrip(_ASCII_SPACE)
+                if body:
+                    if pending:
+                        yield pending
+                    yield body
+                    pending = chunk[len(body):]
+                else:
+                    pending += chunk
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+                stderr.cancel()
+
+    chunks = read()
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        return proc.returncode, None, _decode_output(await stderr)
+
+    async def output():
+        try:
+            yield first
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    return 0, output(), ""
+
+
+def _with_repo(repo_path: str, fn: Callable) -> str | None:
+    """Run fn(repository) on the cached pygit2 handle; None if it can't answer."""
+    entry = _repos.get(repo_path)
+    try:
+        if entry is None:
+            entry = _repos.setdefault(repo_path, (pygit2.Repository(repo_path), threading.Lock()))
+        with entry[1]:
+            return fn(entry[0])
+    except (KeyError, ValueError):  # unknown or malformed revision
+        return None
+    except pygit2.GitError as e:
+        log.debug("pygit2 lookup failed in %s, using git: %s", repo_path, e)
+        _repos.pop(repo_path, None)
+        return None
+
+
+def _commit_id(repo, rev: str):
+    return repo.revparse_single(rev).peel(pygit2.Commit).id
+
+
+async def _merge_base(repo_path: str, branch: str) -> tuple[int, str, str]:
+    """`git merge-base HEAD <branch>`; concurrent callers share one lookup."""
+    key = (repo_path, branch)
+    task = _merge_base_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_find_merge_base(repo_path, branch))
+        _merge_base_inflight[key] = task
+        task.add_done_callback(lambda _: _merge_base_inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def _find_merge_base(repo_path: str, branch: str) -> tuple[int, str, str]:
+    """Answer merge-base in-process when pygit2 is installed.
+
+    Anything pygit2 can't resolve goes to the CLI, which also supplies the
+    error message.
+    """
+    if pygit2 is not None:
+        def lookup(repo):
+            base = repo.merge_base(_commit_id(repo, "HEAD"), _commit_id(repo, branch))
+            return str(base) if base is not None else None
+        base = await asyncio.to_thread(_with_repo, repo_path, lookup)
+        if base is not None:
+            return 0, base, ""
+    return await _run_git("merge-base", "HEAD", branch, cwd=repo_path)
+
+
+async def _rev_parse_pair(repo_path: str, branch: str) -> tuple[int, str, str]:
+    """`git rev-parse HEAD <branch>` (two lines), in-process when pygit2 is installed."""
+    if pygit2 is not None:
+        out = await asyncio.to_thread(
+            _with_repo, repo_path,
+            lambda repo: f"{repo.revparse_single('HEAD').id}\n{repo.revparse_single(branch).id}",
+        )
+        if out is not None:
+            return 0, out, ""
+    return await _run_git("rev-parse", "HEAD", branch, cwd=repo_path)
+
+
+async def create_worktree(repo_path: str, session_id: str, return_base_branch: bool = False) -> dict:
+    """Create a new branch + worktree for a team session.
 
-    # Create the worktree
-    rc, out, err = await _run_git("worktree", "add", wt_dir, branch, cwd=repo_path)
-    if rc != 0:
-        # Clean up branch on failure
-        await _run_git("branch", "-D", branch, cwd=repo_path)
-        return {"error": f"Failed to create worktree: {err}"}
+    Returns dict with branch_name, worktree_path, or error. The current
+    (base) branch is only looked up, as base_branch, if return_base_branch.
+    """
+    branch = _BRANCH_PREFIX_SLASH + session_id
+    wt_dir = os.path.join(repo_path, WORKTREE_DIR, session_id)
+
+    # Create the branch and its worktree from HEAD in one command, looking up
+    # the base branch alongside if asked for
+    runs = [_run_git("worktree", "add", "-b", branch, wt_dir, "HEAD", cwd=repo_path)]
+    if return_base_branch:
+        runs.append(_run_git("rev-parse", "--abbrev-ref", "HEAD", cwd=repo_path))
+    (wrc, _, werr), *head = await asyncio.gather(*runs)
+    if wrc != 0:
+        # git can leave the new branch behind when the checkout fails; -d
+        # (not -D) won't remove a pre-existing branch with unmerged work
+        await _run_git("branch", "-d", branch, cwd=repo_path)
+        return {"error": f"Failed to create worktree: {werr}"}
+
+    result = {"branch_name": branch, "worktree_path": wt_dir}
+    if head:
+        rc, result["base_branch"], err = head[0]
+        if rc != 0:
+            await delete_worktree(repo_path, session_id)
+            return {"error": f"Failed to get current branch: {err}"}
 
     log.info("Created worktree %s on branch %s", wt_dir, branch)
-    return {
-        "branch_name": branch,
-        "worktree_path": wt_dir,
-        "base_branch": base_branch,
-    }
+    return result
 
 
 async def list_worktrees(repo_path: str) -> list[dict]:
@@ -89,73 +247,159 @@ async def list_worktrees(repo_path: str) -> list[dict]:
     return worktrees
 
 
-async def get_worktree_diff(repo_path: str, session_id: str) -> dict:
-    """Get unified diff of worktree changes vs base branch.
+async def _split_stat(chunks: AsyncIterator[bytes]) -> tuple[str, AsyncIterator[bytes] | None]:
+    """Read the --stat section off a `diff --patch-with-stat` stream.
 
-    Checks both committed branch changes AND uncommitted working tree changes.
+    Returns (stat, patch chunks); a blank line separates the two.
     """
-    branch = f"{BRANCH_PREFIX}/{session_id}"
-    wt_dir = str(Path(repo_path) / WORKTREE_DIR / session_id)
+    head = bytearray()
+    async for chunk in chunks:
+        head += chunk
+        cut = head.find(b"\n\n")
+        if cut >= 0:
+            break
+    else:
+        return _decode_output(bytes(head)), None
 
-    # Find merge base
-    rc, base, err = await _run_git("merge-base", "HEAD", branch, cwd=repo_path)
-    if rc != 0:
-        return {"error": f"Failed to find merge base: {err}"}
+    first = bytes(head[cut + 2:]).lstrip(_ASCII_SPACE)
 
-    # First check committed diff (branch vs base)
-    rc, committed_diff, err = await _run_git("diff", base, branch, cwd=repo_path)
-    if rc != 0:
-        return {"error": f"Failed to get diff: {err}"}
+    async def patch():
+        try:
+            if first:
+                yield first
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
 
-    # Also check uncommitted changes in the worktree
-    rc, uncommitted_diff, err = await _run_git("diff", "HEAD", cwd=wt_dir)
-    if rc != 0:
-        uncommitted_diff = ""
+    return _decode_output(bytes(head[:cut])), patch()
 
-    # Combine: prefer uncommitted if present, else committed
-    diff = uncommitted_diff or committed_diff
-    return {"diff": diff, "base_commit": base}
 
+async def open_worktree_diff(repo_path: str, session_id: str, with_stat: bool = False) -> dict:
+    """Get unified diff of worktree changes vs base branch, streamed from git.
 
-async def get_worktree_stat(repo_path: str, session_id: str) -> dict:
-    """Get --stat summary of worktree changes vs base branch."""
-    branch = f"{BRANCH_PREFIX}/{session_id}"
-    wt_dir = str(Path(repo_path) / WORKTREE_DIR / session_id)
-
-    rc, base, err = await _run_git("merge-base", "HEAD", branch, cwd=repo_path)
+    Checks both committed branch changes AND uncommitted working tree changes.
+    "diff" is an async iterator of UTF-8 bytes, or None if there are no
+    changes. Close the iterator if it isn't read to the end. With
+    with_stat=True the same git run also fills in "stat", the --stat summary.
+    """
+    branch = _BRANCH_PREFIX_SLASH + session_id
+    wt_dir = os.path.join(repo_path, WORKTREE_DIR, session_id)
+    diff = ("diff", "--patch-with-stat") if with_stat else ("diff",)
+
+    async def uncommitted():
+        if not os.path.isdir(wt_dir):
+            return 1, None, ""
+        return await _stream_git(*diff, "HEAD", cwd=wt_dir)
+
+    # Find merge base; the worktree's uncommitted diff doesn't depend on it
+    (rc, base, err), (_, chunks, _) = await asyncio.gather(
+        _merge_base(repo_path, branch), uncommitted(),
+    )
     if rc != 0:
+        if chunks is not None:
+            await chunks.aclose()
         return {"error": f"Failed to find merge base: {err}"}
 
-    # Check uncommitted first, then committed
-    rc, stat, err = await _run_git("diff", "--stat", "HEAD", cwd=wt_dir)
-    if rc != 0 or not stat.strip():
-        rc, stat, err = await _run_git("diff", "--stat", base, branch, cwd=repo_path)
+    # Prefer uncommitted changes if present, else the committed diff
+    if chunks is None:
+        rc, chunks, err = await _stream_git(*diff, base, branch, cwd=repo_path)
         if rc != 0:
-            return {"error": f"Failed to get stat: {err}"}
-
-    return {"stat": stat, "base_commit": base}
+            return {"error": f"Failed to get diff: {err}"}
+    result = {"diff": chunks, "base_commit": base}
+    if with_stat:
+        result["stat"], result["diff"] = await _split_stat(chunks) if chunks else ("", None)
+    return result
 
 
-async def merge_worktree(repo_path: str, session_id: str) -> dict:
-    """Merge the team branch into current branch, remove worktree, delete branch."""
-    branch = f"{BRANCH_PREFIX}/{session_id}"
-    wt_dir = str(Path(repo_path) / WORKTREE_DIR / session_id)
-
-    # Commit any uncommitted changes in the worktree first
+async def commit_worktree_changes(repo_path: str, session_id: str) -> None:
+    """Commit anything left uncommitted in the worktree onto its branch."""
+    wt_dir = os.path.join(repo_path, WORKTREE_DIR, session_id)
     await _run_git("add", "-A", cwd=wt_dir)
     await _run_git("commit", "-m", f"Team session {session_id} changes", cwd=wt_dir)
 
-    # Remove worktree first
-    rc, out, err = await _run_git("worktree", "remove", wt_dir, "--force", cwd=repo_path)
+
+async def _merge_tree(repo_path: str, branch: str) -> tuple[bool, list[str]] | None:
+    """Run `git merge-tree --write-tree` against HEAD; None if git can't answer."""
+    rc, out, err = await _run_git(
+        "merge-tree", "--write-tree", "--name-only", "-z", "HEAD", branch, cwd=repo_path,
+    )
+    # -z output: <tree oid> NUL, then conflicted paths each NUL-terminated,
+    # then an empty field before the informational messages
+    fields = out.split("\0")
+    if rc == 0:
+        return True, []
+    if rc != 1 or len(fields) < 2:
+        log.warning("merge-tree failed for %s: %s", branch, err)
+        return None
+    end = fields.index("", 1) if "" in fields[1:] else len(fields)
+    return False, fields[1:end]
+
+
+async def detect_conflicts(repo_path: str, session_id: str) -> tuple[bool, list[str]]:
+    """Check whether merging the team branch into HEAD would conflict.
+
+    Uses `git merge-tree --write-tree`, which merges in memory without
+    touching the index or working tree. Returns (clean, conflicted_files).
+    If git can't answer (e.g. older than 2.38) this reports clean and
+    leaves the real merge to decide.
+
+    Results are memoized on the (HEAD, branch tip) commit pair, so a retry
+    over unchanged branches skips merge-tree; any new commit on either
+    side is a new key. Concurrent calls for the same pair share one run.
+    """
+    branch = _BRANCH_PREFIX_SLASH + session_id
+    rc, out, _ = await _rev_parse_pair(repo_path, branch)
     if rc != 0:
-        log.warning("Worktree remove failed (may already be gone): %s", err)
+        return await _merge_tree(repo_path, branch) or (True, [])
+
+    key = (repo_path, out)
+    task = _merge_cache.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_merge_tree(repo_path, branch))
+        _merge_cache[key] = task
+        while len(_merge_cache) > MERGE_CACHE_SIZE:
+            _merge_cache.popitem(last=False)
+    else:
+        _merge_cache.move_to_end(key)
+
+    try:
+        result = await asyncio.shield(task)
+    except Exception:
+        _merge_cache.pop(key, None)
+        raise
+    if result is None:
+        _merge_cache.pop(key, None)
+        return True, []
+    clean, files = result
+    return clean, list(files)
+
+
+async def merge_worktree(repo_path: str, session_id: str, commit_first: bool = True) -> dict:
+    """Merge the team branch into current branch, remove worktree, delete branch.
+
+    Pass ``commit_first=False`` when the caller has already committed the
+    worktree's changes.
+    """
+    branch = _BRANCH_PREFIX_SLASH + session_id
+    wt_dir = os.path.join(repo_path, WORKTREE_DIR, session_id)
 
-    # Merge with --no-ff to preserve branch history
-    rc, out, err = await _run_git("merge", "--no-ff", branch, "-m", f"Merge team session {session_id}", cwd=repo_path)
+    # Commit any uncommitted changes in the worktree first
+    if commit_first:
+        await commit_worktree_changes(repo_path, session_id)
+
+    # Remove the worktree while merging; a branch checked out in another
+    # worktree can still be merged. Merge with --no-ff to preserve history.
+    (rc, _, err), (mrc, out, merr) = await asyncio.gather(
+        _run_git("worktree", "remove", wt_dir, "--force", cwd=repo_path),
+        _run_git("merge", "--no-ff", branch, "-m", f"Merge team session {session_id}", cwd=repo_path),
+    )
     if rc != 0:
-        return {"error": f"Merge failed: {err}"}
+        log.warning("Worktree remove failed (may already be gone): %s", err)
+    if mrc != 0:
+        return {"error": f"Merge failed: {merr}"}
 
-    # Delete the branch
+    # Delete the branch; git refuses while a worktree still has it checked out
     rc2, out2, err2 = await _run_git("branch", "-d", branch, cwd=repo_path)
     if rc2 != 0:
         log.warning("Branch delete failed: %s", err2)
@@ -166,9 +410,9 @@ async def merge_worktree(repo_path: str, session_id: str) -> dict:
 
 async def get_files_changed(repo_path: str, session_id: str) -> list[str]:
     """Get list of files changed by a branch vs its merge base."""
-    branch = f"{BRANCH_PREFIX}/{session_id}"
+    branch = _BRANCH_PREFIX_SLASH + session_id
 
-    rc, base, err = await _run_git("merge-base", "HEAD", branch, cwd=repo_path)
+    rc, base, err = await _merge_base(repo_path, branch)
     if rc != 0:
         log.warning("Failed to find merge base for %s: %s", branch, err)
         return []
@@ -183,8 +427,8 @@ async def get_files_changed(repo_path: str, session_id: str) -> list[str]:
 
 async def delete_worktree(repo_path: str, session_id: str) -> dict:
     """Force-remove worktree and delete branch without merging."""
-    branch = f"{BRANCH_PREFIX}/{session_id}"
-    wt_dir = str(Path(repo_path) / WORKTREE_DIR / session_id)
+    branch = _BRANCH_PREFIX_SLASH + session_id
+    wt_dir = os.path.join(repo_path, WORKTREE_DIR, session_id)
 
     # Force-remove worktree
     rc, out, err = await _run_git("worktree", "remove", wt_dir, "--force", cwd=repo_path)